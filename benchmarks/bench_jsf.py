@@ -0,0 +1,100 @@
+"""Parse, generate and serialize benchmarks, run with pytest-benchmark.
+
+Every benchmark runs once per schema of the corpus. Generation benchmarks
+also record records per second, peak memory and retained allocations in
+the saved results' extra_info.
+"""
+
+import json
+import subprocess
+import sys
+import tracemalloc
+from copy import deepcopy
+
+import pytest
+from corpus import SCHEMAS
+
+from jsf.parser import JSF
+
+RECORDS = 50
+
+
+@pytest.fixture(params=sorted(SCHEMAS), ids=str)
+def schema(request):
+    return SCHEMAS[request.param]
+
+
+def measure_memory(benchmark, fn):
+    """Records the peak memory of a single call, and the number of memory
+    blocks it leaves allocated."""
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["peak_memory_bytes"] = peak
+    benchmark.extra_info["retained_blocks"] = sys.getallocatedblocks() - blocks
+
+
+def record_throughput(benchmark):
+    if benchmark.stats is not None:  # Not when run with --benchmark-disable
+        benchmark.extra_info["records_per_second"] = RECORDS / benchmark.stats.stats.mean
+
+
+def test_import(benchmark):
+    benchmark.pedantic(
+        subprocess.run,
+        args=([sys.executable, "-c", "import jsf"],),
+        kwargs={"check": True},
+        rounds=5,
+    )
+
+
+@pytest.mark.benchmark(group="parse")
+def test_parse(benchmark, schema):
+    measure_memory(benchmark, lambda: JSF(deepcopy(schema)))
+    benchmark.pedantic(JSF, setup=lambda: ((deepcopy(schema),), {}), rounds=10)
+
+
+@pytest.mark.benchmark(group="generate")
+def test_generate(benchmark, schema):
+    p = JSF(deepcopy(schema), max_recursive_depth=5)
+    p.compile()
+    measure_memory(benchmark, lambda: p.generate(RECORDS))
+    benchmark(p.generate, RECORDS)
+    record_throughput(benchmark)
+
+
+@pytest.mark.benchmark(group="generate-seeded")
+def test_generate_seeded(benchmark, schema):
+    p = JSF(deepcopy(schema), max_recursive_depth=5, seed=0)
+    p.compile()
+    benchmark(p.generate, RECORDS)
+    record_throughput(benchmark)
+
+
+@pytest.mark.benchmark(group="serialize")
+def test_to_jsonl(benchmark, schema, tmp_path):
+    p = JSF(deepcopy(schema), max_recursive_depth=5)
+    p.compile()
+    benchmark(p.to_jsonl, tmp_path / "out.jsonl", RECORDS)
+    record_throughput(benchmark)
+
+
+@pytest.mark.benchmark(group="serialize")
+@pytest.mark.parametrize("name", ["object", "wide", "deep"])
+def test_to_parquet(benchmark, name, tmp_path):
+    pytest.importorskip("pyarrow")
+    p = JSF(deepcopy(SCHEMAS[name]), max_recursive_depth=5)
+    p.compile()
+    benchmark(p.to_parquet, tmp_path / "out.parquet", RECORDS)
+    record_throughput(benchmark)
+
+
+@pytest.mark.benchmark(group="serialize")
+@pytest.mark.parametrize("name", ["object", "wide", "deep"])
+def test_json_dumps(benchmark, name):
+    records = JSF(deepcopy(SCHEMAS[name]), max_recursive_depth=5).generate(RECORDS)
+    benchmark(json.dumps, records)
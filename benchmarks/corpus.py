@@ -0,0 +1,78 @@
+"""Schemas the benchmarks run against: the test data schemas, plus
+synthetic stress schemas."""
+
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+TEST_DATA = Path(__file__).parent.parent / "jsf" / "tests" / "data"
+# external-ref fetches over the network, which would make timings meaningless, and type-list-null
+# isn't a single schema
+EXCLUDED = {"external-ref", "type-list-null"}
+
+
+def wide(n: int = 200) -> Dict[str, Any]:
+    """An object with n properties of mixed types."""
+    types = [
+        {"type": "string"},
+        {"type": "integer", "minimum": 0, "maximum": 1000},
+        {"type": "number"},
+        {"type": "boolean"},
+        {"type": "string", "format": "date-time"},
+        {"enum": ["a", "b", "c"]},
+    ]
+    return {
+        "type": "object",
+        "properties": {f"field{i}": types[i % len(types)] for i in range(n)},
+        "required": [f"field{i}" for i in range(0, n, 2)],
+    }
+
+
+def deep(depth: int = 50) -> Dict[str, Any]:
+    """Objects nested depth levels deep."""
+    schema: Dict[str, Any] = {"type": "string"}
+    for i in range(depth):
+        schema = {
+            "type": "object",
+            "properties": {"id": {"type": "integer"}, f"child{i}": schema},
+            "required": ["id", f"child{i}"],
+        }
+    return schema
+
+
+def refs(n: int = 100) -> Dict[str, Any]:
+    """An object referencing the same definition n times."""
+    address = wide(20)
+    return {
+        "type": "object",
+        "definitions": {"Address": address},
+        "properties": {f"address{i}": {"$ref": "#/definitions/Address"} for i in range(n)},
+    }
+
+
+def patterns(n: int = 100) -> Dict[str, Any]:
+    """An object of n pattern constrained strings, like IDs and SKUs."""
+    return {
+        "type": "object",
+        "properties": {
+            f"code{i}": {
+                "type": "string",
+                "pattern": f"^[A-Z]{{3}}-[0-9]{{{i % 8 + 1}}}(-[a-f0-9]{{4}})?$",
+            }
+            for i in range(n)
+        },
+        "required": [f"code{i}" for i in range(n)],
+    }
+
+
+def load() -> Dict[str, Dict[str, Any]]:
+    schemas = {
+        path.stem: json.loads(path.read_text())
+        for path in sorted(TEST_DATA.glob("*.json"))
+        if path.stem not in EXCLUDED
+    }
+    schemas.update({"wide": wide(), "deep": deep(), "refs": refs(), "patterns": patterns()})
+    return schemas
+
+
+SCHEMAS = load()
@@ -1,11 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from fastapi import FastAPI
 
 from jsf import JSF
 
 app = FastAPI(docs_url="/")
-generator = JSF.from_json("custom.json")
+# Generation is CPU bound, so it runs in a thread pool rather than on the event loop
+generator = JSF.from_json("custom.json", thread_safe=True)
+executor = ThreadPoolExecutor()
 
 
 @app.get("/generate", response_model=generator.pydantic())
-def read_root():
-    return generator.generate()
+async def read_root():
+    return await generator.agenerate(executor=executor)
@@ -2,7 +2,6 @@ import json
 from enum import Enum
 from pathlib import Path
 
-import jsonlines
 import pandas as pd
 import typer
 from typing_extensions import Annotated
@@ -36,11 +35,11 @@ def main(
     output: Annotated[Path, typer.Option(help="Output file path")],
 ):
     faker = JSF.from_json(schema)
-    fake_data = faker.generate(records)
     match output_format:
         case OutputFormat.csv:
-            pd.DataFrame.from_records(fake_data).to_csv(output, index=False)
+            pd.DataFrame.from_records(faker.generate(records)).to_csv(output, index=False)
         case OutputFormat.excel:
+            fake_data = faker.generate(records)
             more_fake_data = faker.generate(records)
             custom_header = [
                 v.get("title") or k for k, v in faker.root_schema["properties"].items()
@@ -54,12 +53,11 @@ def main(
                 )
         case OutputFormat.json:
             with open(output, "w") as f:
-                json.dump(fake_data, f)
+                json.dump(faker.generate(records), f)
         case OutputFormat.jsonl:
-            with jsonlines.open(output, mode="w") as writer:
-                writer.write_all(fake_data)
+            faker.to_jsonl(output, records)
         case OutputFormat.parquet:
-            pd.DataFrame.from_records(fake_data).to_parquet(output, index=False)
+            faker.to_parquet(output, records)
         case _:
             raise NotImplementedError("Unable to produce in this file format yet")
 
@@ -1 +1,2 @@
 from jsf.parser import JSF
+from jsf.relational import Dataset
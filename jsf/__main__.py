@@ -0,0 +1,3 @@
+from jsf.cli import app
+
+app(prog_name="jsf")
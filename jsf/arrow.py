@@ -0,0 +1,172 @@
+import json
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterator, List, Optional, Set, Tuple
+
+import pyarrow as pa  # pants: no-infer-dep
+import pyarrow.parquet as pq  # pants: no-infer-dep
+
+from jsf.schema_types import (
+    AllOf,
+    AnyOf,
+    Array,
+    Boolean,
+    Integer,
+    JSFEnum,
+    JSFTuple,
+    Null,
+    Number,
+    Object,
+    OneOf,
+    String,
+)
+from jsf.schema_types.base import BaseSchema
+
+if TYPE_CHECKING:
+    from jsf.parser import JSF
+
+Converter = Callable[[Any], Any]
+ArrowField = Tuple[pa.DataType, Optional[Converter]]
+
+
+def _to_json(value: Any) -> Optional[str]:
+    return None if value is None else json.dumps(value)
+
+
+# Values Arrow can't type precisely (unions of types, dynamic keys, recursion) are stored as JSON
+JSON_FIELD: ArrowField = (pa.string(), _to_json)
+
+
+def _enum_field(values: List[Any]) -> ArrowField:
+    kinds = {type(v) for v in values if v is not None}
+    if kinds == {bool}:
+        return pa.bool_(), None
+    if kinds == {str}:
+        return pa.string(), None
+    if kinds == {int}:
+        return pa.int64(), None
+    if kinds and kinds <= {int, float}:
+        return pa.float64(), None
+    if not kinds:
+        return pa.null(), None
+    return JSON_FIELD
+
+
+def _object_field(node: Object, visiting: Set[int]) -> ArrowField:
+    if node.patternProperties or not isinstance(node.properties, list):
+        return JSON_FIELD
+    fields, converters = [], []
+    for prop in node.properties:
+        _type, convert = _arrow_field(prop, visiting)
+        fields.append(pa.field(prop.name, _type))
+        if convert is not None:
+            converters.append((prop.name, convert))
+    if not converters:
+        return pa.struct(fields), None
+
+    def convert(value: Any) -> Any:
+        if value is not None:
+            for name, _convert in converters:
+                if name in value:
+                    value[name] = _convert(value[name])
+        return value
+
+    return pa.struct(fields), convert
+
+
+def _array_field(node: Array, visiting: Set[int]) -> ArrowField:
+    _type, convert_item = _arrow_field(node.items, visiting)
+    if convert_item is None:
+        return pa.list_(_type), None
+
+    def convert(value: Any) -> Any:
+        return None if value is None else [convert_item(v) for v in value]
+
+    return pa.list_(_type), convert
+
+
+def _tuple_field(node: JSFTuple, visiting: Set[int]) -> ArrowField:
+    items = [_arrow_field(item, visiting) for item in node.items]
+    fields = [pa.field(str(i), _type) for i, (_type, _) in enumerate(items)]
+
+    def convert(value: Any) -> Any:
+        if value is None:
+            return None
+        return {
+            str(i): v if _convert is None else _convert(v)
+            for i, (v, (_, _convert)) in enumerate(zip(value, items))
+        }
+
+    return pa.struct(fields), convert
+
+
+def _union_field(schemas: List[BaseSchema], visiting: Set[int]) -> ArrowField:
+    fields = [_arrow_field(schema, visiting) for schema in schemas]
+    if len({_type for _type, _ in fields}) == 1 and all(c is None for _, c in fields):
+        return fields[0]
+    return JSON_FIELD
+
+
+def _arrow_field(node: BaseSchema, visiting: Set[int]) -> ArrowField:
+    if id(node) in visiting:
+        return JSON_FIELD
+    visiting = visiting | {id(node)}
+    if isinstance(node, Integer):
+        return pa.int64(), None
+    if isinstance(node, Number):
+        return pa.float64(), None
+    if isinstance(node, String):
+        return pa.string(), None
+    if isinstance(node, Boolean):
+        return pa.bool_(), None
+    if isinstance(node, Null):
+        return pa.null(), None
+    if isinstance(node, JSFEnum):
+        return _enum_field(node.enum)
+    if isinstance(node, Object):
+        return _object_field(node, visiting)
+    if isinstance(node, Array):
+        return _array_field(node, visiting)
+    if isinstance(node, JSFTuple):
+        return _tuple_field(node, visiting)
+    if isinstance(node, AllOf):
+        return _arrow_field(node.combined_schema, visiting)
+    if isinstance(node, (AnyOf, OneOf)):
+        return _union_field(node.schemas, visiting)
+    return JSON_FIELD  # pragma: no cover
+
+
+def arrow_schema(root: BaseSchema) -> Tuple[pa.Schema, Optional[Converter]]:
+    """Maps a parsed object schema to an Arrow schema, along with the
+    conversion records need before they match it, if any."""
+    if not isinstance(root, Object):
+        raise ValueError("Arrow output requires the root schema to be an object")
+    _type, convert = _arrow_field(root, set())
+    if not pa.types.is_struct(_type):
+        raise ValueError("Arrow output requires the root object to have fixed properties")
+    return pa.schema(list(_type)), convert
+
+
+def iter_record_batches(
+    generator: "JSF", n: int, batch_size: int = 10_000
+) -> Iterator[pa.RecordBatch]:
+    """Generates n records as Arrow record batches of at most batch_size
+    rows, so that only one batch is held in memory at a time."""
+    schema, convert = arrow_schema(generator.root)
+    records = generator.iter_generate(n)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return
+        if convert is not None:
+            batch = [convert(record) for record in batch]
+        yield pa.RecordBatch.from_pylist(batch, schema=schema)
+
+
+def to_parquet(generator: "JSF", path: Path, n: int, batch_size: int = 10_000, **kwargs) -> None:
+    """Streams n generated records to a Parquet file, one record batch at a
+    time. Extra keyword arguments are passed to `pyarrow.parquet.ParquetWriter`."""
+    schema, _ = arrow_schema(generator.root)
+    with pq.ParquetWriter(path, schema, **kwargs) as writer:
+        for batch in iter_record_batches(generator, n, batch_size):
+            writer.write_batch(batch)
@@ -1,4 +1,11 @@
+import json
+import sys
+from contextlib import contextmanager
+from enum import Enum
+from itertools import islice
 from pathlib import Path
+from time import perf_counter
+from typing import IO, Any, Iterator, Optional, Tuple
 
 import typer  # pants: no-infer-dep
 
@@ -7,6 +14,43 @@ from jsf.parser import JSF
 app = typer.Typer()
 
 
+class Format(str, Enum):
+    json = "json"
+    jsonl = "jsonl"
+
+
+@contextmanager
+def _open(instance: Path) -> Iterator[IO[str]]:
+    if str(instance) == "-":
+        yield sys.stdout
+    else:
+        with open(instance, "w") as f:
+            yield f
+
+
+def _batches(records: Iterator[Any], batch_size: int, fmt: Format) -> Iterator[Tuple[str, int]]:
+    """Serializes the records a batch at a time, as JSON Lines or as the
+    items of a JSON array."""
+    separator = "\n" if fmt is Format.jsonl else ",\n"
+    first = True
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return
+        text = separator.join(json.dumps(record) for record in batch)
+        if fmt is Format.jsonl:
+            yield f"{text}\n", len(batch)
+        else:
+            yield text if first else f"{separator}{text}", len(batch)
+        first = False
+
+
+def _report(done: int, count: int, start: float) -> None:
+    elapsed = perf_counter() - start
+    rate = done / elapsed if elapsed else 0.0
+    typer.echo(f"\r{done:,}/{count:,} records ({rate:,.0f} records/s)", nl=False, err=True)
+
+
 @app.command()
 def main(
     schema: Path = typer.Option(
@@ -26,6 +70,43 @@ def main(
         writable=True,
         readable=False,
         resolve_path=True,
+        allow_dash=True,
+        help="File to write to, or - for stdout.",
+    ),
+    count: int = typer.Option(
+        1, min=1, help="Number of instances. Several are written as an array in json format."
+    ),
+    fmt: Format = typer.Option(Format.json, "--format", help="Output format."),
+    seed: Optional[int] = typer.Option(None, help="Seed making the output reproducible."),
+    workers: Optional[int] = typer.Option(
+        None, min=1, help="Number of processes generating instances. Defaults to one, in process."
     ),
+    batch_size: int = typer.Option(
+        1000, min=1, help="Number of instances generated and written at a time."
+    ),
+    progress: bool = typer.Option(True, help="Report progress and throughput on stderr."),
 ):
-    JSF.from_json(schema).to_json(instance)
+    faker = JSF.from_json(schema, seed=seed)
+    if count == 1 and fmt is Format.json:
+        with _open(instance) as f:
+            json.dump(faker.generate(), f)
+        return
+
+    if workers is None:
+        records = faker.iter_generate(count)
+    else:
+        records = faker.iter_generate_parallel(count, workers, chunk_size=batch_size)
+
+    done, start = 0, perf_counter()
+    with _open(instance) as f:
+        if fmt is Format.json:
+            f.write("[\n")
+        for text, size in _batches(records, batch_size, fmt):
+            f.write(text)
+            done += size
+            if progress:
+                _report(done, count, start)
+        if fmt is Format.json:
+            f.write("\n]\n")
+    if progress:
+        typer.echo(err=True)
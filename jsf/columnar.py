@@ -0,0 +1,112 @@
+from typing import Any, Dict, List, Union
+
+import numpy as np  # pants: no-infer-dep
+
+from jsf.schema_types import Boolean, Integer, JSFEnum, Null, Number, Object
+from jsf.schema_types.base import BaseSchema
+
+Vectorized = (Number, Boolean, JSFEnum, Null)
+
+
+class Columns(Dict[str, np.ndarray]):
+    """Column arrays keyed by property name, along with the mask of the
+    records each optional property was dropped from."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.dropped: Dict[str, np.ndarray] = {}
+
+
+def is_vectorizable(node: BaseSchema, context: Dict[str, Any]) -> bool:
+    """Whether whole columns of the node can be drawn at once, i.e. it is a
+    primitive with no provider, state or recursion to evaluate per value."""
+    return (
+        isinstance(node, Vectorized)
+        and node.provider is None
+        and node.set_state is None
+        and not node.unique
+        and not node.is_recursive
+        and not (context.get("use_defaults", False) and node.default)
+        and not (context.get("use_examples", False) and node.examples)
+    )
+
+
+def _enum_values(enum: List[Any]) -> np.ndarray:
+    kinds = {type(v) for v in enum}
+    # Numpy would silently turn mixed types (eg 1 and "1") into strings
+    if len(kinds) == 1 and kinds <= {str, int, float}:
+        return np.array(enum)
+    values = np.empty(len(enum), dtype=object)
+    values[:] = enum
+    return values
+
+
+def _draw(node: BaseSchema, n: int, rng: np.random.Generator) -> np.ndarray:
+    if isinstance(node, Number):
+        step, low, high = node._bounds()
+        values = step * rng.integers(low, high + 1, n)
+        return values.astype(np.int64 if isinstance(node, Integer) else np.float64)
+    if isinstance(node, Boolean):
+        return rng.random(n) < 0.5
+    if isinstance(node, JSFEnum):
+        return _enum_values(node.enum)[rng.integers(0, len(node.enum), n)]
+    return np.full(n, None, dtype=object)  # Null
+
+
+def generate_column(
+    node: BaseSchema, n: int, rng: np.random.Generator, context: Dict[str, Any]
+) -> np.ndarray:
+    """Generates n values of the node as a single array. Null values are
+    masked."""
+    if is_vectorizable(node, context):
+        values = _draw(node, n, rng)
+        if node.is_nullable and not isinstance(node, Null):
+            return np.ma.masked_array(values, mask=rng.random(n) < node.allow_none_optionals)
+        return values
+
+    generate = node.generate
+    values = np.empty(n, dtype=object)
+    for i in range(n):
+        values[i] = generate(context)
+    if node.is_nullable:
+        return np.ma.masked_array(values, mask=[v is None for v in values])
+    return values
+
+
+def generate_columns(
+    root: BaseSchema, n: int, rng: np.random.Generator, context: Dict[str, Any]
+) -> Columns:
+    """Generates n records as a dict of column arrays, one per property of
+    the root object.
+
+    Primitive properties are drawn a whole column at a time; anything else
+    is generated value by value into an object array. Null values and
+    dropped optional properties are masked, the latter also being recorded
+    in the `dropped` masks of the columns.
+    """
+    if not isinstance(root, Object):
+        raise ValueError("Columnar generation requires the root schema to be an object")
+
+    required = set(root.required or [])
+    columns = Columns()
+    for prop in root.properties:
+        column = generate_column(prop, n, rng, context)
+        if prop.name not in required:
+            dropped = rng.random(n) <= root.allow_none_optionals
+            column = np.ma.masked_array(column, mask=np.ma.getmaskarray(column) | dropped)
+            columns.dropped[prop.name] = dropped
+        columns[prop.name] = column
+    return columns
+
+
+def columns_to_records(columns: Dict[str, Union[np.ndarray, np.ma.MaskedArray]]) -> List[Any]:
+    """Converts columns back into a list of records, using None for masked
+    values, and leaving out the optional properties dropped from each
+    record."""
+    names = list(columns)
+    values = [column.tolist() for column in columns.values()]
+    records = [dict(zip(names, row)) for row in zip(*values)]
+    for name, dropped in getattr(columns, "dropped", {}).items():
+        for i in np.flatnonzero(dropped):
+            del records[i][name]
+    return records
@@ -1,19 +1,40 @@
+import hashlib
+import importlib
 import json
 import logging
+import os
+import pickle
 import random
-from collections import ChainMap
+import threading
+from collections import ChainMap, deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from contextlib import suppress
 from copy import deepcopy
-from datetime import datetime
-from itertools import count
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import count, islice
 from pathlib import Path
-from types import MappingProxyType
-from typing import Any, Dict, List, Optional, Tuple, Union
+from random import Random
+from time import perf_counter
+from types import MappingProxyType, ModuleType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from urllib.parse import urlsplit, urlunsplit
 
-from faker import Faker
-from jsonschema import validate
 from pydantic import confloat
-from smart_open import open as s_open
 
+from jsf.profile import Profile
 from jsf.schema_types import (
     AllOf,
     AllTypes,
@@ -26,9 +47,185 @@ from jsf.schema_types import (
     Primitives,
     PrimitiveTypes,
 )
+from jsf.schema_types.base import Compiled, Pending
+from jsf.state import State
+from jsf.unique import DEFAULT_MAX_MEMORY, UniqueIndexes
+
+if TYPE_CHECKING:
+    from faker import Faker
 
 logger = logging.getLogger()
-faker = Faker()
+
+
+class _LazyFaker:
+    """Stands in for a Faker instance, which is only built, and the faker
+    package only imported, once it is first used."""
+
+    def __init__(self) -> None:
+        self._faker: Optional["Faker"] = None
+
+    def _load(self) -> "Faker":
+        if self._faker is None:
+            from faker import Faker
+
+            self._faker = Faker()
+        return self._faker
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__") or name == "_faker":
+            raise AttributeError(name)
+        return getattr(self._load(), name)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "Faker":
+        return deepcopy(self._load(), memo)
+
+
+faker = _LazyFaker()
+
+
+def _derive_seed(*parts: Any) -> int:
+    """Derives a 64 bit seed from the given parts, stable across processes
+    and platforms."""
+    return int.from_bytes(hashlib.blake2b(repr(parts).encode(), digest_size=8).digest(), "big")
+
+
+def _normalize_uri(uri: str) -> str:
+    parts = urlsplit(uri)
+    if len(parts.scheme) <= 1:  # A local path, possibly with a Windows drive letter
+        return os.path.abspath(os.path.expanduser(uri))
+    if parts.scheme == "file":
+        return os.path.abspath(parts.path)
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", parts.query, "")
+    )
+
+
+def _resolve_uri(uri: str, ref_map: Dict[str, str]) -> str:
+    """Normalizes the URI of an external document, and redirects it to a local
+    copy if it falls under one of the mapped prefixes (the longest wins)."""
+    uri = _normalize_uri(uri)
+    prefixes = {_normalize_uri(prefix): local for prefix, local in ref_map.items()}
+    for prefix in sorted(prefixes, key=len, reverse=True):
+        if uri.startswith(prefix):
+            return _normalize_uri(os.path.join(prefixes[prefix], uri[len(prefix) :].lstrip("/")))
+    return uri
+
+
+def _digest(content: str) -> str:
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+
+def _read_document(location: str) -> str:
+    from smart_open import open as s_open
+
+    with s_open(location, "r") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=128)
+def _load_external(location: str, ref_map: Tuple[Tuple[str, str], ...]) -> Tuple["JSF", str]:
+    """Loads and parses an external document once per process, returning it
+    along with the digest of its content."""
+    content = _read_document(location)
+    return JSF(json.loads(content), ref_map=dict(ref_map)), _digest(content)
+
+
+def _fill_pending(value: Any, resolved: Dict[int, Any]) -> Any:
+    """Replaces the placeholders of coroutine providers in a generated object
+    with their awaited values, in place where possible."""
+    if isinstance(value, Pending):
+        return resolved[id(value)]
+    if isinstance(value, dict):
+        for k, v in value.items():
+            value[k] = _fill_pending(v, resolved)
+    elif isinstance(value, list):
+        value[:] = [_fill_pending(v, resolved) for v in value]
+    elif isinstance(value, tuple):
+        return tuple(_fill_pending(v, resolved) for v in value)
+    return value
+
+
+# The instant seeded generation takes as now, so that dates don't depend on the clock
+SEEDED_NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+# Bump when the layout of cached parsed schemas changes
+_CACHE_FORMAT = 1
+
+
+def _cache_key(content: str, *options: Any) -> str:
+    """Hashes the schema and its options, which are serialized to JSON so
+    that equal options always give the same key. Raises a TypeError for
+    options that aren't JSON serializable."""
+    import importlib.metadata
+
+    try:
+        version = importlib.metadata.version("jsf")
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+    return _digest(json.dumps([_CACHE_FORMAT, version, content, options], sort_keys=True))
+
+
+def _read_cache(path: Path, context: Dict[str, Any]) -> Optional["JSF"]:
+    """Loads a parsed schema from the cache, unless it is missing, unreadable
+    or any of its external documents has changed since it was cached."""
+    try:
+        with open(path, "rb") as f:
+            documents, state = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:  # Stale or corrupt entries are parsed again, and replaced
+        logger.warning(f"Ignoring unreadable schema cache {path}: {e}")
+        return None
+    for location, digest in documents.items():
+        if _digest(_read_document(location)) != digest:
+            return None
+    generator = JSF.__new__(JSF)
+    generator.__setstate__({**state, "base_context": context})
+    if generator.thread_safe:
+        generator.compile()
+    return generator
+
+
+class _ModuleReference:
+    """Pickles a module found in the generation context by name."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def load(self) -> ModuleType:
+        return importlib.import_module(self.name)
+
+
+def _reference_modules(d: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        k: _ModuleReference(v.__name__) if isinstance(v, ModuleType) else v for k, v in d.items()
+    }
+
+
+def _load_modules(d: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v.load() if isinstance(v, _ModuleReference) else v for k, v in d.items()}
+
+
+class _ThreadLocalContext(threading.local):
+    """Gives every thread its own random number generator, and its own copy
+    of the context's faker, seeded independently."""
+
+    def __init__(self, faker: "Faker"):
+        self.random = Random()
+        self.faker = deepcopy(faker)
+        self.faker.seed_instance(self.random.getrandbits(64))
+
+
+_worker_generator: Optional["JSF"] = None
+
+
+def _init_worker(generator: "JSF") -> None:
+    global _worker_generator
+    _worker_generator = generator
+
+
+def _generate_shard(shard: int, shards: int, start: int, n: int, **kwargs: Any) -> List[Any]:
+    return _worker_generator._generate_shard(shard, shards, start, n, **kwargs)
 
 
 class JSF:
@@ -37,7 +234,10 @@ class JSF:
     Attributes:
         root_schema (Dict[str, Any]): The JSON schema based on which the fake data is generated.
         definitions (Dict): A dictionary to store definitions used in the JSON schema.
-        base_state (Dict[str, Any]): A dictionary that represents the state of the parser. It includes a counter, a list of all JSON paths, and the provided initial state.
+        base_state (Dict[str, Any]): A dictionary that represents the state of the parser. It includes a counter, a tuple of all JSON paths, and the provided initial state. Each generation layers its own copy-on-write `State` over it.
+        seed (Optional[int]): The seed from which every record's random number generator and faker seed are derived, if any.
+        thread_safe (bool): Whether generation may be called from several threads at once.
+        ref_map (Dict[str, str]): Local copies of external documents, keyed by the URI prefix they stand in for.
     """
 
     def __init__(
@@ -54,6 +254,10 @@ class JSF:
         initial_state: Dict[str, Any] = MappingProxyType({}),
         allow_none_optionals: confloat(ge=0.0, le=1.0) = 0.5,
         max_recursive_depth: int = 10,
+        seed: Optional[int] = None,
+        thread_safe: bool = False,
+        ref_map: Optional[Dict[str, str]] = None,
+        unique_memory: int = DEFAULT_MAX_MEMORY,
     ):
         """Initializes the JSF generator with the provided schema and
         configuration options.
@@ -64,6 +268,10 @@ class JSF:
             initial_state (Dict[str, Any], optional): A dictionary that represents the initial state of the parser. If you wish to extend the state so it can be accesses by your schema you can add any references in here. Defaults to an empty dictionary.
             allow_none_optionals (confloat, optional): A parameter that determines the probability of optional fields being set to None. Defaults to 0.5.
             max_recursive_depth (int, optional): A parameter that determines the maximum depth when generating a recursive schema. Defaults to 10.
+            seed (int, optional): Makes generation deterministic. Each record is generated from a random number generator and faker seeded from the seed and the record index (or key), so any record can be regenerated on its own. Defaults to None.
+            thread_safe (bool, optional): Makes generation safe to call from several threads at once. Each thread draws from its own random number generator and its own copy of the context's faker, and the schema is compiled up front, so generation shares no mutable state between threads. Defaults to False.
+            ref_map (Dict[str, str], optional): Maps URI prefixes of external `$ref` documents to local directories or files, eg. {"https://example.com/schemas/": "./schemas"}, so they can be resolved offline. External documents are loaded and parsed once per process whatever the mapping. Defaults to None.
+            unique_memory (int, optional): The memory, in bytes, the exact index of the values of each `$unique` field may take before it turns into a Bloom filter. Fields marked `$unique` never repeat a value within one generation (one call to `generate`, or one `iter_generate` stream), but they aren't unique across separate generations or worker processes. Defaults to 256MiB.
         """
         self.root_schema = schema
         self.definitions = {}
@@ -71,14 +279,44 @@ class JSF:
             "__counter__": count(start=1),
             "__all_json_paths__": [],
             "__depth__": 0,
+            "__unique__": UniqueIndexes(unique_memory),
             **initial_state,
         }
-        self.base_context = context
         self.allow_none_optionals = allow_none_optionals
         self.max_recursive_depth = max_recursive_depth
+        self.seed = seed
+        self.ref_map = dict(ref_map or {})
+        self._parse_random = Random(_derive_seed(seed, "parse")) if seed is not None else random
+        self.thread_safe = thread_safe
+        self._set_context(context)
 
         self.root = None
+        self._generator = None
+        # Digests of the external documents the schema references, keyed by location
+        self._external_documents: Dict[str, str] = {}
         self._parse(schema)
+        if thread_safe:
+            self.compile()
+
+    def _set_context(self, context: Dict[str, Any]) -> None:
+        self.base_context = context
+        if self.seed is not None and context.get("faker", faker) is faker:
+            # Seeded generators reseed their faker, so they get one of their own
+            self.base_context = {**context, "faker": _LazyFaker()}
+        self._local = (
+            _ThreadLocalContext(self.base_context.get("faker", faker)) if self.thread_safe else None
+        )
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = _reference_modules({**self.__dict__, "_generator": None, "_local": None})
+        state["base_context"] = _reference_modules(self.base_context)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        state = _load_modules(state)
+        context = _load_modules(state.pop("base_context"))
+        self.__dict__.update(state)
+        self._set_context(context)
 
     @staticmethod
     def from_json(
@@ -94,6 +332,11 @@ class JSF:
         initial_state: Dict[str, Any] = MappingProxyType({}),
         allow_none_optionals: confloat(ge=0.0, le=1.0) = 0.5,
         max_recursive_depth: int = 10,
+        seed: Optional[int] = None,
+        thread_safe: bool = False,
+        ref_map: Optional[Dict[str, str]] = None,
+        unique_memory: int = DEFAULT_MAX_MEMORY,
+        cache_dir: Optional[Path] = None,
     ) -> "JSF":
         """Initializes the JSF generator with the provided schema at the given
         path and configuration options.
@@ -104,11 +347,65 @@ class JSF:
             initial_state (Dict[str, Any], optional): A dictionary that represents the initial state of the parser. If you wish to extend the state so it can be accesses by your schema you can add any references in here. Defaults to an empty dictionary.
             allow_none_optionals (confloat, optional): A parameter that determines the probability of optional fields being set to None. Defaults to 0.5.
             max_recursive_depth (int, optional): A parameter that determines the maximum depth when generating a recursive schema. Defaults to 10.
+            seed (int, optional): Makes generation deterministic, see `JSF.__init__`. Defaults to None.
+            thread_safe (bool, optional): Makes generation safe to call from several threads at once, see `JSF.__init__`. Defaults to False.
+            ref_map (Dict[str, str], optional): Local copies of external `$ref` documents, see `JSF.__init__`. Defaults to None.
+            unique_memory (int, optional): The memory each `$unique` field's exact index may take, see `JSF.__init__`. Defaults to 256MiB.
+            cache_dir (Path, optional): A directory in which to keep parsed schemas, keyed by a hash of the schema, its options and the jsf version, so that later loads skip parsing. An entry is only used while the external documents it references are unchanged. Schemas whose initial state isn't JSON serializable aren't cached. Entries are pickles, so the directory must only be writable by trusted users. Defaults to None.
         """
         with open(path) as f:
-            return JSF(
-                json.load(f), context, initial_state, allow_none_optionals, max_recursive_depth
-            )
+            content = f.read()
+        cache_path = None
+        if cache_dir is not None:
+            try:
+                key = _cache_key(
+                    content,
+                    dict(initial_state),
+                    allow_none_optionals,
+                    max_recursive_depth,
+                    seed,
+                    thread_safe,
+                    dict(ref_map or {}),
+                    unique_memory,
+                )
+            except TypeError as e:
+                logger.warning(f"Not caching {path}, its initial state can't be keyed: {e}")
+            else:
+                cache_path = Path(cache_dir) / f"{key}.pickle"
+                generator = _read_cache(cache_path, context)
+                if generator is not None:
+                    return generator
+        generator = JSF(
+            json.loads(content),
+            context,
+            initial_state,
+            allow_none_optionals,
+            max_recursive_depth,
+            seed,
+            thread_safe,
+            ref_map,
+            unique_memory,
+        )
+        if cache_path is not None:
+            generator._write_cache(cache_path)
+        return generator
+
+    def _write_cache(self, path: Path) -> None:
+        # The context is supplied afresh on every load, so it isn't cached
+        state = {**self.__getstate__(), "base_context": {}}
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        # The schema is parsed already, failing to cache it, eg. on a read-only file system, is
+        # only worth a warning
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump((self._external_documents, state), f)
+            os.replace(tmp_path, path)
+        except (pickle.PicklingError, TypeError, AttributeError, OSError) as e:
+            logger.warning(f"Unable to cache the parsed schema: {e}")
+            # The file may never have been created, or be just as impossible to remove
+            with suppress(OSError):
+                tmp_path.unlink()
 
     def __parse_primitive(self, name: str, path: str, schema: Dict[str, Any]) -> PrimitiveTypes:
         item_type, is_nullable = self.__is_field_nullable(schema)
@@ -170,6 +467,7 @@ class JSF:
         )
         root = arr if root is None else root
         arr.items = self.__parse_definition(name, f"{path}/items", schema["items"], root=root)
+        arr.check_unique_items()
         return arr
 
     def __parse_tuple(
@@ -200,10 +498,10 @@ class JSF:
             if "null" in item_type and len(set(item_type)) >= 2:
                 item_type_deep_copy = deepcopy(item_type)
                 item_type_deep_copy.remove("null")
-                return random.choice(item_type_deep_copy), True
+                return self._parse_random.choice(item_type_deep_copy), True
             if len(set(item_type)) >= 1:
                 item_type_deep_copy = deepcopy(item_type)
-                return random.choice(item_type_deep_copy), False
+                return self._parse_random.choice(item_type_deep_copy), False
         return item_type, False
 
     def __parse_anyOf(
@@ -298,20 +596,24 @@ class JSF:
             ext, frag = schema["$ref"].split("#")
             if ext == "":
                 if f"#{frag}" in self.definitions:
-                    cls = deepcopy(self.definitions.get(f"#{frag}"))
+                    cls = self.definitions.get(f"#{frag}")
                 else:
                     # parse referenced definition
                     ref_name = frag.split("/")[-1]
                     cls = self.__parse_named_definition(path, ref_name, root)
             else:
-                with s_open(ext, "r") as f:
-                    external_jsf = JSF(json.load(f))
-                cls = deepcopy(external_jsf.definitions.get(f"#{frag}"))
-            if path != "#" and cls == root:
+                location = _resolve_uri(ext, self.ref_map)
+                ref_map = tuple(sorted(self.ref_map.items()))
+                external_jsf, digest = _load_external(location, ref_map)
+                self._external_documents.update(
+                    {location: digest, **external_jsf._external_documents}
+                )
+                cls = external_jsf.definitions.get(f"#{frag}")
+            if path != "#" and cls is root:
                 cls.name = name
             elif path != "#":
-                cls.name = name
-                cls.path = path
+                # References share the definition's subtree, only the referencing node is copied
+                cls = cls.model_copy(update={"name": name, "path": path})
             return cls
         elif "anyOf" in schema:
             return self.__parse_anyOf(name, path, schema, root)
@@ -334,10 +636,51 @@ class JSF:
                     self.definitions[f"#/{def_tag}/{name}"] = item
 
         self.root = self.__parse_definition(name="root", path="#", schema=schema)
+        # Frozen so that generation states can share it rather than copy it
+        self.base_state["__all_json_paths__"] = tuple(self.base_state["__all_json_paths__"])
+
+    def compile(self) -> Callable[[Dict[str, Any]], Any]:
+        """Compiles the parsed schema into a single generator function.
+
+        Every schema node is turned into a closure specialised to its
+        keywords once, so generation no longer inspects the schema tree.
+        The result is cached and reused by the generation methods.
+        """
+        self._generator = self.root.compile()
+        return self._generator
 
     @property
     def context(self):
-        return {**self.base_context, "state": deepcopy(self.base_state)}
+        context = {
+            "random": random,
+            "faker": faker,
+            **self.base_context,
+            "state": State(self.base_state),
+        }
+        if self._local is not None:
+            context["random"], context["faker"] = self._local.random, self._local.faker
+        return context
+
+    def _seeded_context(self, context: Dict[str, Any], *key: Any) -> Dict[str, Any]:
+        record_seed = _derive_seed(self.seed, *key)
+        context["faker"].seed_instance(record_seed)
+        return {**context, "random": Random(record_seed), "__now__": SEEDED_NOW}
+
+    def _iter_records(
+        self,
+        context: Dict[str, Any],
+        n: Optional[int],
+        start: int = 0,
+        generate: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> Iterator[Any]:
+        generate = generate or self._generator or self.compile()
+        indices = range(start, start + n) if n is not None else count(start)
+        if self.seed is None:
+            for _ in indices:
+                yield generate(context)
+        else:
+            for index in indices:
+                yield generate(self._seeded_context(context, "index", index))
 
     def generate(
         self, n: Optional[int] = None, *, use_defaults: bool = False, use_examples: bool = False
@@ -350,10 +693,291 @@ class JSF:
             use_defaults (bool, optional): prefer the default value as defined in the schema over a randomly generated object. Defaults to False.
             use_examples (bool, optional): prefer an example as defined in the schema over a randomly generated object. This parameter is preceded by the `use_defaults` parameter if set. Defaults to False.
         """
-        context = {**self.context, "use_defaults": use_defaults, "use_examples": use_examples}
         if n is None or n == 1:
-            return self.root.generate(context=context)
-        return [self.root.generate(context=context) for _ in range(n)]
+            context = {**self.context, "use_defaults": use_defaults, "use_examples": use_examples}
+            return next(self._iter_records(context, 1))
+        return list(self.iter_generate(n, use_defaults=use_defaults, use_examples=use_examples))
+
+    def iter_generate(
+        self, n: Optional[int] = None, *, use_defaults: bool = False, use_examples: bool = False
+    ) -> Iterator[Any]:
+        """Lazily generates fake objects from the provided schema, one at a
+        time, sharing state between them like `generate` does.
+
+        Args:
+            n (int, optional): The number of objects to yield. If n is not provided the iterator is infinite.
+            use_defaults (bool, optional): prefer the default value as defined in the schema over a randomly generated object. Defaults to False.
+            use_examples (bool, optional): prefer an example as defined in the schema over a randomly generated object. This parameter is preceded by the `use_defaults` parameter if set. Defaults to False.
+        """
+        context = {**self.context, "use_defaults": use_defaults, "use_examples": use_examples}
+        yield from self._iter_records(context, n)
+
+    async def agenerate(
+        self,
+        n: Optional[int] = None,
+        *,
+        use_defaults: bool = False,
+        use_examples: bool = False,
+        batch_size: int = 100,
+        executor: Optional[Executor] = None,
+    ) -> Any:
+        """Generates fake objects like `generate` does, without blocking the
+        event loop for longer than it takes to generate batch_size objects.
+
+        Args:
+            n (int, optional): If n is provided, it returns a list of n objects. If n is 1 then it returns a single object.
+            use_defaults (bool, optional): prefer the default value as defined in the schema over a randomly generated object. Defaults to False.
+            use_examples (bool, optional): prefer an example as defined in the schema over a randomly generated object. This parameter is preceded by the `use_defaults` parameter if set. Defaults to False.
+            batch_size (int, optional): The number of objects generated between two yields to the event loop. Defaults to 100.
+            executor (Executor, optional): Generate the batches in this executor rather than in the event loop, so that large objects don't block it either. Generators that may be used by several executor threads at once must be thread safe. Defaults to None.
+        """
+        records = self.aiter_generate(
+            1 if n is None else n,
+            use_defaults=use_defaults,
+            use_examples=use_examples,
+            batch_size=batch_size,
+            executor=executor,
+        )
+        fakes = [record async for record in records]
+        return fakes[0] if n is None or n == 1 else fakes
+
+    async def aiter_generate(
+        self,
+        n: Optional[int] = None,
+        *,
+        use_defaults: bool = False,
+        use_examples: bool = False,
+        batch_size: int = 100,
+        executor: Optional[Executor] = None,
+    ) -> AsyncIterator[Any]:
+        """Lazily generates fake objects like `iter_generate` does, yielding
+        to the event loop after every batch_size objects.
+
+        A `$provider` may return an awaitable, such as the result of calling
+        a coroutine function. The awaitables of each batch are awaited
+        concurrently, and their results replace them in the objects.
+
+        Args:
+            n (int, optional): The number of objects to yield. If n is not provided the iterator is infinite.
+            use_defaults (bool, optional): prefer the default value as defined in the schema over a randomly generated object. Defaults to False.
+            use_examples (bool, optional): prefer an example as defined in the schema over a randomly generated object. This parameter is preceded by the `use_defaults` parameter if set. Defaults to False.
+            batch_size (int, optional): The number of objects generated between two yields to the event loop. Defaults to 100.
+            executor (Executor, optional): Generate the batches in this executor rather than in the event loop, so that large objects don't block it either. Generators that may be used by several executor threads at once must be thread safe. Defaults to None.
+        """
+        import asyncio
+
+        pending: List[Pending] = []
+        context = {
+            **self.context,
+            "use_defaults": use_defaults,
+            "use_examples": use_examples,
+            "__pending__": pending,
+        }
+        records = self._iter_records(context, n)
+
+        def next_batch() -> List[Any]:
+            if self._local is not None:
+                # Draw from the generators of the thread the batch runs in
+                context["random"], context["faker"] = self._local.random, self._local.faker
+            return list(islice(records, batch_size))
+
+        loop = asyncio.get_running_loop()
+        while True:
+            if executor is None:
+                batch = next_batch()
+            else:
+                batch = await loop.run_in_executor(executor, next_batch)
+            if not batch:
+                return
+            if pending:
+                values = await asyncio.gather(*(p.awaitable for p in pending))
+                resolved = {id(p): p.coerce(v) for p, v in zip(pending, values)}
+                batch = [_fill_pending(record, resolved) for record in batch]
+                pending.clear()
+            for record in batch:
+                yield record
+            if executor is None:
+                await asyncio.sleep(0)
+
+    def generate_at(
+        self, index: int, *, use_defaults: bool = False, use_examples: bool = False
+    ) -> Any:
+        """Generates the fake object found at the given index of the seeded
+        output, without generating the objects before it.
+
+        Values drawn from state shared between records, such as
+        `__counter__`, start afresh rather than continuing from record
+        index - 1.
+
+        Args:
+            index (int): The position of the object in the output of `generate` and `iter_generate`.
+            use_defaults (bool, optional): prefer the default value as defined in the schema over a randomly generated object. Defaults to False.
+            use_examples (bool, optional): prefer an example as defined in the schema over a randomly generated object. This parameter is preceded by the `use_defaults` parameter if set. Defaults to False.
+        """
+        return self._generate_seeded(("index", index), use_defaults, use_examples)
+
+    def generate_for_key(
+        self, key: Hashable, *, use_defaults: bool = False, use_examples: bool = False
+    ) -> Any:
+        """Generates the fake object for the given key, such as a user id.
+        Every seeded generator built from the same schema and seed returns
+        the same object for the same key.
+
+        Args:
+            key (Hashable): The business key identifying the object, its repr must be stable across processes.
+            use_defaults (bool, optional): prefer the default value as defined in the schema over a randomly generated object. Defaults to False.
+            use_examples (bool, optional): prefer an example as defined in the schema over a randomly generated object. This parameter is preceded by the `use_defaults` parameter if set. Defaults to False.
+        """
+        return self._generate_seeded(("key", key), use_defaults, use_examples)
+
+    def profile(
+        self, n: int = 100, *, use_defaults: bool = False, use_examples: bool = False
+    ) -> Profile:
+        """Generates n fake objects like `generate` does, timing every schema
+        node, and returns the call counts, null rates, and cumulative and self
+        times collected for each JSON path. The generated objects are
+        discarded.
+
+        Args:
+            n (int, optional): The number of objects to generate. Defaults to 100.
+            use_defaults (bool, optional): prefer the default value as defined in the schema over a randomly generated object. Defaults to False.
+            use_examples (bool, optional): prefer an example as defined in the schema over a randomly generated object. This parameter is preceded by the `use_defaults` parameter if set. Defaults to False.
+        """
+        profile = Profile()
+        generate = self.root.compile(Compiled(hook=profile.wrap))
+        context = {**self.context, "use_defaults": use_defaults, "use_examples": use_examples}
+        start = perf_counter()
+        for _ in self._iter_records(context, n, generate=generate):
+            profile.records += 1
+        profile.total_time = perf_counter() - start
+        return profile
+
+    def _generate_seeded(self, key: Tuple[Any, ...], use_defaults: bool, use_examples: bool) -> Any:
+        if self.seed is None:
+            raise ValueError("Deterministic generation requires the JSF instance to have a seed")
+        context = {**self.context, "use_defaults": use_defaults, "use_examples": use_examples}
+        return (self._generator or self.compile())(self._seeded_context(context, *key))
+
+    def _generate_shard(
+        self, shard: int, shards: int, start: int, n: int, **kwargs: Any
+    ) -> List[Any]:
+        context = {**self.context, **kwargs}
+        if self.seed is None:
+            # Forked workers inherit the random number generators of the parent process, so every
+            # shard draws from freshly seeded ones instead of repeating the records of the others
+            shard_seed = int.from_bytes(os.urandom(8), "big")
+            context["faker"].seed_instance(shard_seed)
+            context["random"] = Random(shard_seed)
+        state = context["state"]
+        # Interleave the counter so that no two shards ever hand out the same value
+        state["__counter__"] = count(start=next(state["__counter__"]) + shard, step=shards)
+        return list(self._iter_records(context, n, start))
+
+    def iter_generate_parallel(
+        self,
+        n: int,
+        workers: Optional[int] = None,
+        *,
+        chunk_size: int = 1000,
+        ordered: bool = True,
+        use_defaults: bool = False,
+        use_examples: bool = False,
+    ) -> Iterator[Any]:
+        """Generates n fake objects from the provided schema across a pool of
+        processes, yielding them as the chunks complete.
+
+        Each chunk is generated with its own state, and its `__counter__`
+        hands out values that no other chunk will, so counters stay unique
+        across the whole output. The generator, including its context and
+        initial state, must be picklable; modules in the context are
+        re-imported by name in the workers.
+
+        Args:
+            n (int): The number of objects to generate.
+            workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+            chunk_size (int, optional): The number of objects each task generates. Defaults to 1000.
+            ordered (bool, optional): yield the chunks in the order they were scheduled, rather than as soon as they finish. Defaults to True.
+            use_defaults (bool, optional): prefer the default value as defined in the schema over a randomly generated object. Defaults to False.
+            use_examples (bool, optional): prefer an example as defined in the schema over a randomly generated object. This parameter is preceded by the `use_defaults` parameter if set. Defaults to False.
+        """
+        workers = workers or os.cpu_count() or 1
+        sizes = [min(chunk_size, n - start) for start in range(0, n, chunk_size)]
+        chunks = iter(enumerate(sizes))
+        kwargs = {"use_defaults": use_defaults, "use_examples": use_examples}
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(self,)) as pool:
+
+            def schedule(chunks: Iterator[Tuple[int, int]]) -> List[Future]:
+                return [
+                    pool.submit(
+                        _generate_shard, shard, len(sizes), shard * chunk_size, size, **kwargs
+                    )
+                    for shard, size in chunks
+                ]
+
+            # Bound the number of chunks in flight so memory doesn't grow with n
+            pending = deque(schedule(islice(chunks, 2 * workers)))
+            while pending:
+                if ordered:
+                    done = pending.popleft()
+                else:
+                    done = next(iter(wait(pending, return_when=FIRST_COMPLETED).done))
+                    pending.remove(done)
+                pending.extend(schedule(islice(chunks, 1)))
+                yield from done.result()
+
+    def generate_parallel(
+        self,
+        n: int,
+        workers: Optional[int] = None,
+        *,
+        chunk_size: int = 1000,
+        ordered: bool = True,
+        use_defaults: bool = False,
+        use_examples: bool = False,
+    ) -> List[Any]:
+        """Generates n fake objects from the provided schema across a pool of
+        processes, and returns them as a list. See `iter_generate_parallel`."""
+        return list(
+            self.iter_generate_parallel(
+                n,
+                workers,
+                chunk_size=chunk_size,
+                ordered=ordered,
+                use_defaults=use_defaults,
+                use_examples=use_examples,
+            )
+        )
+
+    def generate_columns(
+        self, n: int, *, use_defaults: bool = False, use_examples: bool = False
+    ) -> Dict[str, Any]:
+        """Generates n fake objects from the provided object schema as a dict
+        of NumPy column arrays, one per property. Requires numpy.
+
+        Number, integer, boolean and enum properties, and their null and
+        optional decisions, are drawn a whole column at a time; any other
+        property is generated one value at a time into an object array. Null
+        values and dropped optional properties are both masked, use
+        `jsf.columnar.columns_to_records` to turn the columns into records,
+        which leaves dropped properties out.
+
+        Args:
+            n (int): The number of objects to generate.
+            use_defaults (bool, optional): prefer the default value as defined in the schema over a randomly generated object. Defaults to False.
+            use_examples (bool, optional): prefer an example as defined in the schema over a randomly generated object. This parameter is preceded by the `use_defaults` parameter if set. Defaults to False.
+        """
+        import numpy as np  # pants: no-infer-dep
+
+        from jsf.columnar import generate_columns
+
+        context = {**self.context, "use_defaults": use_defaults, "use_examples": use_examples}
+        column_seed = None
+        if self.seed is not None:
+            column_seed = _derive_seed(self.seed, "columns")
+            context = self._seeded_context(context, "columns")
+        return generate_columns(self.root, n, np.random.default_rng(column_seed), context)
 
     def pydantic(self):
         """Generates a fake object from the provided schema and provides the
@@ -363,7 +987,9 @@ class JSF:
     def generate_and_validate(self) -> None:
         """Generates a fake object from the provided schema and performs
         validation on the result."""
-        fake = self.root.generate(context=self.context)
+        from jsonschema import validate
+
+        fake = self.generate()
         validate(instance=fake, schema=self.root_schema)
 
     def to_json(self, path: Path, **kwargs) -> None:
@@ -371,3 +997,29 @@ class JSF:
         output to the given path."""
         with open(path, "w") as f:
             json.dump(self.generate(), f, **kwargs)
+
+    def to_jsonl(self, path: Path, n: int, **kwargs) -> None:
+        """Generates n fake objects from the provided schema and streams them
+        to the given path as JSON Lines, writing each object as soon as it is
+        generated."""
+        with open(path, "w") as f:
+            for fake in self.iter_generate(n):
+                f.write(json.dumps(fake, **kwargs))
+                f.write("\n")
+
+    def iter_record_batches(self, n: int, batch_size: int = 10_000) -> Iterator[Any]:
+        """Generates n fake objects from the provided object schema as Arrow
+        record batches of at most batch_size rows, typed from the schema.
+        Requires pyarrow."""
+        from jsf.arrow import iter_record_batches
+
+        return iter_record_batches(self, n, batch_size)
+
+    def to_parquet(self, path: Path, n: int, batch_size: int = 10_000, **kwargs) -> None:
+        """Generates n fake objects from the provided object schema and
+        streams them to a Parquet file at the given path, one record batch at
+        a time, so memory is bounded by the batch size. Objects and arrays
+        become Arrow structs and lists. Requires pyarrow."""
+        from jsf.arrow import to_parquet
+
+        to_parquet(self, path, n, batch_size, **kwargs)
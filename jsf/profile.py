@@ -0,0 +1,119 @@
+import json
+from dataclasses import asdict, dataclass
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from jsf.schema_types.base import BaseSchema, GenerateFn
+
+COLUMNS = ("path", "calls", "nulls", "cumulative_time", "self_time")
+
+
+@dataclass
+class PathStats:
+    """Generation statistics of the schema nodes found at one JSON path.
+
+    Times are in seconds. The cumulative time includes the time spent in
+    child nodes, the self time doesn't.
+    """
+
+    calls: int = 0
+    nulls: int = 0
+    cumulative_time: float = 0.0
+    self_time: float = 0.0
+
+    @property
+    def null_rate(self) -> float:
+        return self.nulls / self.calls if self.calls else 0.0
+
+
+class Profile:
+    """Collects generation statistics per JSON path, from the functions
+    compiled with its `wrap` hook.
+
+    Profiled functions must be called from a single thread at a time.
+    """
+
+    def __init__(self) -> None:
+        self.stats: Dict[str, PathStats] = {}
+        self.records = 0
+        self.total_time = 0.0
+        # Time spent in the children of each profiled call in progress
+        self._children: List[float] = []
+        # Paths with a call in progress, so that recursive calls aren't counted twice
+        self._active: Dict[str, int] = {}
+
+    def wrap(self, node: BaseSchema, fn: GenerateFn) -> GenerateFn:
+        path = node.path or "#"
+        stats = self.stats.setdefault(path, PathStats())
+        children, active = self._children, self._active
+
+        def profiled(context: Dict[str, Any]) -> Any:
+            children.append(0.0)
+            active[path] = active.get(path, 0) + 1
+            start = perf_counter()
+            try:
+                value = fn(context)
+            finally:
+                elapsed = perf_counter() - start
+                child_time = children.pop()
+                if children:
+                    children[-1] += elapsed
+                active[path] -= 1
+                if not active[path]:
+                    stats.cumulative_time += elapsed
+                stats.self_time += elapsed - child_time
+                stats.calls += 1
+            if value is None:
+                stats.nulls += 1
+            return value
+
+        return profiled
+
+    def rows(self, sort_by: str = "cumulative_time") -> List[Dict[str, Any]]:
+        """Returns the statistics of every path as a list of rows, in
+        descending order of the given column."""
+        if sort_by not in COLUMNS + ("null_rate",):
+            raise ValueError(f"Cannot sort profile by {sort_by}")
+        rows = [
+            {"path": path, **asdict(stats), "null_rate": stats.null_rate}
+            for path, stats in self.stats.items()
+        ]
+        return sorted(rows, key=lambda row: row[sort_by], reverse=sort_by != "path")
+
+    def to_json(self, sort_by: str = "cumulative_time", **kwargs: Any) -> str:
+        """Serializes the profile to JSON. Extra keyword arguments are passed
+        to `json.dumps`."""
+        return json.dumps(
+            {"records": self.records, "total_time": self.total_time, "paths": self.rows(sort_by)},
+            **kwargs,
+        )
+
+    def table(self, sort_by: str = "cumulative_time", limit: Optional[int] = None) -> str:
+        """Formats the statistics of the paths as a plain text table, with
+        times in milliseconds and the share of the total generation time
+        spent in each path."""
+        rows = self.rows(sort_by)[:limit]
+        total = self.total_time or 1.0
+        lines = [
+            (
+                row["path"],
+                str(row["calls"]),
+                f"{row['null_rate']:.1%}",
+                f"{row['cumulative_time'] * 1000:.2f}",
+                f"{row['self_time'] * 1000:.2f}",
+                f"{row['self_time'] / total:.1%}",
+            )
+            for row in rows
+        ]
+        header = ("path", "calls", "null rate", "cumulative ms", "self ms", "self %")
+        widths = [max(len(cell) for cell in column) for column in zip(header, *lines)]
+        return "\n".join(
+            "  ".join(
+                cell.ljust(width) if i == 0 else cell.rjust(width)
+                for i, (cell, width) in enumerate(zip(line, widths))
+            ).rstrip()
+            for line in [header, *lines]
+        )
+
+    def __str__(self) -> str:
+        return self.table()
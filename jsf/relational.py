@@ -0,0 +1,234 @@
+import json
+import random
+from array import array
+from copy import deepcopy
+from pathlib import Path
+from random import Random
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union, cast
+
+from jsf.parser import JSF, _derive_seed
+
+# Keys a parent table keeps for its children to reference, past which they are reservoir sampled
+DEFAULT_KEY_CAPACITY = 1_000_000
+INT64_MIN, INT64_MAX = -(2**63), 2**63 - 1
+
+
+class KeyIndex:
+    """A bounded, uniform sample of the keys of a parent table.
+
+    Integer keys are held in a typed array of 64 bit integers, which only
+    takes 8 bytes per key, and any other keys in a list. Once capacity keys
+    are held, further keys replace held ones at random (reservoir sampling),
+    so that every key seen so far is equally likely to be held whatever the
+    number of parents. Only held keys are referenced, so every reference
+    points to a parent that was generated.
+    """
+
+    def __init__(self, name: str, capacity: int = DEFAULT_KEY_CAPACITY, seed: Optional[int] = None):
+        if capacity < 1:
+            raise ValueError(f"The key capacity of {name} must be at least 1, got {capacity}")
+        self.name = name
+        self.capacity = capacity
+        self.seed = seed
+        self.clear()
+
+    def clear(self) -> None:
+        self.keys: Union[array, List[Any]] = array("q")
+        self.seen = 0
+        self.rng = Random(self.seed) if self.seed is not None else cast(Random, random)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "KeyIndex":
+        # Generation state is copied per generation, but keys are shared by every generation
+        return self
+
+    def add(self, key: Any) -> None:
+        keys = self.keys
+        if isinstance(keys, array) and not (type(key) is int and INT64_MIN <= key <= INT64_MAX):
+            keys = self.keys = keys.tolist()
+        self.seen += 1
+        if len(keys) < self.capacity:
+            keys.append(key)
+        else:
+            slot = self.rng.randrange(self.seen)
+            if slot < self.capacity:
+                keys[slot] = key
+
+    def sample(self, rng: Random) -> Any:
+        """Draws one of the held keys."""
+        if not self.keys:
+            raise ValueError(f"There are no keys of {self.name} to reference")
+        return self.keys[rng.randrange(len(self.keys))]
+
+
+def _split(reference: str, schemas: Dict[str, Dict[str, Any]]) -> Tuple[str, str]:
+    table, _, field = reference.partition(".")
+    if table not in schemas or not field:
+        raise ValueError(
+            f"Invalid reference {reference!r}, expected a <table>.<field> of {list(schemas)}"
+        )
+    if field not in schemas[table].get("properties", {}):
+        raise ValueError(f"Invalid reference {reference!r}, {table} has no property {field!r}")
+    return table, field
+
+
+def _inline_ref(schema: Dict[str, Any], field: str, reference: str) -> None:
+    """Replaces a property defined by a local `$ref` with the definition it
+    references, so that keywords added to the property aren't ignored next
+    to the `$ref`."""
+    prop = schema["properties"][field]
+    seen = set()
+    while "$ref" in prop:
+        ref = prop["$ref"]
+        if not ref.startswith("#/") or ref in seen:
+            raise ValueError(
+                f"Invalid reference {reference!r}, its $ref {ref!r} can't be inlined, "
+                "only acyclic references within the table's schema can"
+            )
+        seen.add(ref)
+        target: Any = schema
+        for part in ref[2:].split("/"):
+            part = part.replace("~1", "/").replace("~0", "~")
+            if not isinstance(target, dict) or part not in target:
+                raise ValueError(f"Invalid reference {reference!r}, its $ref {ref!r} is missing")
+            target = target[part]
+        prop = {**deepcopy(target), **{k: v for k, v in prop.items() if k != "$ref"}}
+    schema["properties"][field] = prop
+
+
+def _order(tables: List[str], parents: Dict[str, List[str]]) -> List[str]:
+    """Orders the tables so that every table comes after the tables it
+    references."""
+    ordered: List[str] = []
+    visiting: List[str] = []
+
+    def visit(table: str) -> None:
+        if table in ordered:
+            return
+        if table in visiting:
+            cycle = visiting[visiting.index(table) :] + [table]
+            raise ValueError(f"The relations between {' -> '.join(cycle)} form a cycle")
+        visiting.append(table)
+        for parent in parents[table]:
+            visit(parent)
+        visiting.pop()
+        ordered.append(table)
+
+    for table in tables:
+        visit(table)
+    return ordered
+
+
+class Dataset:
+    """Generates related records of several schemas, where the foreign keys
+    of child records reference the keys of parent records generated before
+    them.
+
+    Tables are generated one after the other, parents first, and streamed
+    rather than held in memory. Only the keys of parent tables are kept, in
+    a `KeyIndex` of at most key_capacity keys per referenced field, from
+    which the foreign keys of child records are drawn.
+
+    Attributes:
+        generators (Dict[str, JSF]): The generator of each table, in generation order.
+        indexes (Dict[str, KeyIndex]): The keys kept for each referenced `<table>.<field>`.
+    """
+
+    def __init__(
+        self,
+        schemas: Dict[str, Dict[str, Any]],
+        relations: Dict[str, str],
+        key_capacity: int = DEFAULT_KEY_CAPACITY,
+        seed: Optional[int] = None,
+        **options: Any,
+    ):
+        """Initializes a generator for each schema, with its foreign keys
+        drawn from the keys of the tables they reference.
+
+        Args:
+            schemas (Dict[str, Dict[str, Any]]): The object schema of each table, keyed by table name.
+            relations (Dict[str, str]): Maps each foreign key to the key it references, both as `<table>.<field>` where the field is a property of the table's schema, eg. {"orders.user_id": "users.id"}. A foreign key is drawn from the generated keys, replacing any `$provider` it had. A referenced key is marked `$unique` unless its schema sets `$unique` itself. Keys defined by a `$ref` within their table's schema are inlined first.
+            key_capacity (int, optional): The number of keys kept for each referenced field. Past it, the keys kept are a uniform sample of those generated. Defaults to 1,000,000.
+            seed (int, optional): Makes generation deterministic, each table being seeded from it and its name. Defaults to None.
+            **options: Options passed on to the `JSF` generator of every table, eg. allow_none_optionals.
+        """
+        schemas = deepcopy(schemas)
+        parents: Dict[str, List[str]] = {table: [] for table in schemas}
+        self.indexes: Dict[str, KeyIndex] = {}
+        self._keys: Dict[str, List[Tuple[str, KeyIndex]]] = {table: [] for table in schemas}
+        for foreign_key, key in relations.items():
+            child, child_field = _split(foreign_key, schemas)
+            parent, parent_field = _split(key, schemas)
+            parents[child].append(parent)
+            for table, field in ((child, child_field), (parent, parent_field)):
+                _inline_ref(schemas[table], field, f"{table}.{field}")
+            if key not in self.indexes:
+                key_seed = _derive_seed(seed, "keys", key) if seed is not None else None
+                self.indexes[key] = KeyIndex(key, key_capacity, key_seed)
+                self._keys[parent].append((parent_field, self.indexes[key]))
+                schemas[parent]["properties"][parent_field].setdefault("$unique", True)
+            lookup = f"lambda: state['__keys__'][{key!r}].sample(random)"
+            schemas[child]["properties"][child_field]["$provider"] = lookup
+
+        initial_state = {**options.pop("initial_state", {}), "__keys__": self.indexes}
+        self.generators: Dict[str, JSF] = {}
+        for table in _order(list(schemas), parents):
+            self.generators[table] = JSF(
+                schemas[table],
+                initial_state=initial_state,
+                seed=_derive_seed(seed, "table", table) if seed is not None else None,
+                **options,
+            )
+
+    def iter_generate(self, counts: Dict[str, int], **kwargs: Any) -> Iterator[Tuple[str, Any]]:
+        """Lazily generates counts[table] records of each table, parents
+        first, yielding (table, record) pairs.
+
+        Args:
+            counts (Dict[str, int]): The number of records of each table. Tables left out aren't generated, and their children reference the keys of their last generation.
+            **kwargs: Options passed on to `JSF.iter_generate`, eg. use_defaults.
+        """
+        unknown = set(counts) - set(self.generators)
+        if unknown:
+            raise ValueError(
+                f"Unknown tables {sorted(unknown)}, expected some of {list(self.generators)}"
+            )
+        for table, generator in self.generators.items():
+            if table not in counts:
+                continue
+            keys = self._keys[table]
+            for _, index in keys:
+                index.clear()
+            for record in generator.iter_generate(counts[table], **kwargs):
+                for field, index in keys:
+                    key = record.get(field)
+                    if key is not None:
+                        index.add(key)
+                yield table, record
+
+    def generate(self, counts: Dict[str, int], **kwargs: Any) -> Dict[str, List[Any]]:
+        """Generates counts[table] records of each table, and returns the
+        records of each table as a list."""
+        records: Dict[str, List[Any]] = {table: [] for table in self.generators if table in counts}
+        for table, record in self.iter_generate(counts, **kwargs):
+            records[table].append(record)
+        return records
+
+    def to_jsonl(self, directory: Path, counts: Dict[str, int], **kwargs: Any) -> None:
+        """Generates counts[table] records of each table and streams them to
+        `<table>.jsonl` files in the given directory, writing each record as
+        soon as it is generated."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        files: Dict[str, Any] = {}
+        try:
+            for table, record in self.iter_generate(counts):
+                if table not in files:
+                    files[table] = open(directory / f"{table}.jsonl", "w")
+                files[table].write(json.dumps(record, **kwargs))
+                files[table].write("\n")
+        finally:
+            for file in files.values():
+                file.close()
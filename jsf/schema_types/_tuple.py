@@ -2,7 +2,7 @@ from typing import Any, Dict, List, Optional, Tuple, Type, Union
 
 from pydantic import Field
 
-from jsf.schema_types.base import BaseSchema, ProviderNotSetException
+from jsf.schema_types.base import BaseSchema, Compiled, GenerateFn
 
 
 class JSFTuple(BaseSchema):
@@ -19,18 +19,21 @@ class JSFTuple(BaseSchema):
     def from_dict(cls, d: Dict[str, Any]) -> "JSFTuple":
         return JSFTuple(**d)
 
-    def generate(self, context: Dict[str, Any]) -> Optional[List[Tuple]]:
+    def _compile_value(self, compiled: Compiled) -> GenerateFn:
         # TODO:  Random drop out "It's ok to not provide all of the items"
-        try:
-            return super().generate(context)
-        except ProviderNotSetException:
-            depth = context["state"]["__depth__"]
+        items = [item.compile(compiled) for item in self.items]
+
+        def generate(context: Dict[str, Any]) -> Tuple:
+            state = context["state"]
+            depth = state["__depth__"]
             output = []
-            for item in self.items:
-                output.append(item.generate(context))
-                context["state"]["__depth__"] = depth
+            for item in items:
+                output.append(item(context))
+                state["__depth__"] = depth
             return tuple(output)
 
+        return generate
+
     def model(self, context: Dict[str, Any]) -> Tuple[Type, Any]:
         _type = eval(
             f"Tuple[{','.join([item.model(context)[0].__name__ for item in self.items])}]",
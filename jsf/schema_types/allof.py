@@ -1,6 +1,6 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict
 
-from jsf.schema_types.base import BaseSchema, ProviderNotSetException
+from jsf.schema_types.base import BaseSchema, Compiled, GenerateFn
 
 
 class AllOf(BaseSchema):
@@ -10,11 +10,8 @@ class AllOf(BaseSchema):
     def from_dict(cls, d: Dict[str, Any]) -> "AllOf":
         return AllOf(**d)
 
-    def generate(self, context: Dict[str, Any]) -> Optional[Any]:
-        try:
-            return super().generate(context)
-        except ProviderNotSetException:
-            return self.combined_schema.generate(context)
+    def _compile_value(self, compiled: Compiled) -> GenerateFn:
+        return self.combined_schema.compile(compiled)
 
     def model(self, context: Dict[str, Any]) -> None:
         pass
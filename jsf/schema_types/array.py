@@ -1,9 +1,12 @@
-import random
 from typing import Any, Dict, List, Optional, Tuple, Type, Union
 
 from pydantic import Field
 
-from jsf.schema_types.base import BaseSchema, ProviderNotSetException
+from jsf.schema_types.base import BaseSchema, Compiled, GenerateFn, compile_expression, freeze
+
+# Duplicates drawn in a row, for every unique item found so far, before giving up on uniqueness
+DUPLICATES_PER_ITEM = 10
+MIN_DUPLICATES = 100
 
 
 class Array(BaseSchema):
@@ -18,34 +21,72 @@ class Array(BaseSchema):
     def from_dict(cls, d: Dict[str, Any]) -> "Array":
         return Array(**d)
 
-    def generate(self, context: Dict[str, Any]) -> Optional[List[Any]]:
-        try:
-            return super().generate(context)
-        except ProviderNotSetException:
-            if isinstance(self.fixed, str):
-                self.minItems = self.maxItems = eval(self.fixed, context)()
-            elif isinstance(self.fixed, int):
-                self.minItems = self.maxItems = self.fixed
+    def _compile_expressions(self) -> Dict[str, Any]:
+        code = super()._compile_expressions()
+        if isinstance(self.fixed, str):
+            code["$fixed"] = compile_expression(self.fixed, self.path, "$fixed")
+        return code
+
+    def check_unique_items(self) -> None:
+        """Fails fast, once the items are parsed, if they can't take enough
+        distinct values to fill the minimum number of unique items."""
+        min_items = self.fixed if isinstance(self.fixed, int) else self.minItems
+        if not self.uniqueItems or self.items is None or not min_items:
+            return
+        size = self.items.domain_size()
+        if size is not None and size < min_items:
+            raise ValueError(
+                f"Array at {self.path} requires {min_items} unique items, "
+                f"but its items only take {size} distinct values"
+            )
+
+    def _compile_value(self, compiled: Compiled) -> GenerateFn:
+        item = self.items.compile(compiled)
+        fixed, min_items, max_items = self._code.get("$fixed"), self.minItems, self.maxItems
+        if isinstance(self.fixed, int):
+            min_items = max_items = self.fixed
+        unique, path = self.uniqueItems, self.path
+        domain_size = self.items.domain_size() if unique else None
 
-            depth = context["state"]["__depth__"]
+        def generate(context: Dict[str, Any]) -> List[Any]:
+            _min, _max = min_items, max_items
+            if fixed is not None:
+                _min = _max = eval(fixed, context)()
+
+            state = context["state"]
+            depth = state["__depth__"]
+            n = context["random"].randint(int(_min), int(_max))
             output = []
-            for _ in range(random.randint(int(self.minItems), int(self.maxItems))):
-                output.append(self.items.generate(context))
-                context["state"]["__depth__"] = depth
-            if self.uniqueItems and self.items.type == "object":
-                output = [dict(s) for s in {frozenset(d.items()) for d in output}]
-                while len(output) < self.minItems:
-                    output.append(self.items.generate(context))
-                    output = [dict(s) for s in {frozenset(d.items()) for d in output}]
-                    context["state"]["__depth__"] = depth
-            elif self.uniqueItems:
-                output = set(output)
-                while len(output) < self.minItems:
-                    output.add(self.items.generate(context))
-                    context["state"]["__depth__"] = depth
-                output = list(output)
+            if not unique:
+                for _ in range(n):
+                    output.append(item(context))
+                    state["__depth__"] = depth
+                return output
+
+            if domain_size is not None:
+                n = min(n, domain_size)
+            seen = set()
+            duplicates = 0
+            while len(output) < n:
+                value = item(context)
+                state["__depth__"] = depth
+                key = freeze(value)
+                if key not in seen:
+                    seen.add(key)
+                    output.append(value)
+                    duplicates = 0
+                    continue
+                duplicates += 1
+                if duplicates > max(MIN_DUPLICATES, DUPLICATES_PER_ITEM * len(output)):
+                    if len(output) >= _min:
+                        break
+                    raise ValueError(
+                        f"Could not generate {int(_min)} unique items for the array at {path}"
+                    )
             return output
 
+        return generate
+
     def model(self, context: Dict[str, Any]) -> Tuple[Type, Any]:
         _type = eval(
             f"List[Union[{','.join([self.items.model(context)[0].__name__])}]]",
@@ -1,16 +1,61 @@
 import logging
-import random
 import uuid
-from typing import Any, Dict, List, Optional, Tuple, Type, Union
+from types import CodeType
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Type, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from typing_extensions import Self
 
 logger = logging.getLogger()
 
+# Values drawn in a row that were already taken, before a `$unique` field gives up
+MAX_UNIQUE_RETRIES = 1000
 
-class ProviderNotSetException(Exception):
-    ...
+GenerateFn = Callable[[Dict[str, Any]], Any]
+Hook = Callable[["BaseSchema", GenerateFn], GenerateFn]
+
+
+class Compiled(Dict[int, Optional[GenerateFn]]):
+    """Functions compiled for a tree, keyed by node id, along with an
+    optional hook wrapping the function compiled for each node."""
+
+    def __init__(self, hook: Optional[Hook] = None):
+        super().__init__()
+        self.hook = hook
+
+
+def compile_expression(source: str, path: Optional[str], keyword: str) -> CodeType:
+    """Compiles a custom keyword's Python expression once, reporting the JSON
+    path of the schema it belongs to if it is invalid."""
+    try:
+        return compile(source, f"{path}/{keyword}", "eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid {keyword} expression at {path}: {e.msg}") from e
+
+
+def freeze(value: Any) -> Hashable:
+    """A hashable key of a JSON value, equal for values JSON considers
+    equal. Booleans are kept apart from the numbers Python equates them
+    with."""
+    if isinstance(value, dict):
+        return ("object", frozenset((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return ("array", tuple(freeze(v) for v in value))
+    if isinstance(value, bool):
+        return ("boolean", value)
+    return value
+
+
+class Pending:
+    """Stands in for the value of a coroutine `$provider` in a generated
+    object, until the coroutine is awaited by the asynchronous generation
+    methods."""
+
+    __slots__ = ("awaitable", "coerce")
+
+    def __init__(self, awaitable: Any, coerce: Callable[[Any], Any]):
+        self.awaitable = awaitable
+        self.coerce = coerce
 
 
 class BaseSchema(BaseModel):
@@ -33,37 +78,181 @@ class BaseSchema(BaseModel):
     name: Optional[str] = None
     provider: Optional[str] = Field(None, alias="$provider")
     set_state: Optional[Dict[str, str]] = Field(None, alias="$state")
+    unique: Optional[bool] = Field(None, alias="$unique")
     is_nullable: bool = False
     is_recursive: bool = False
     allow_none_optionals: float = Field(0.5, ge=0.0, le=1.0)
     max_recursive_depth: int = 10
 
+    _generator: Optional[GenerateFn] = PrivateAttr(None)
+    # Code objects of the custom keyword expressions, compiled when the node is parsed
+    _code: Dict[str, Any] = PrivateAttr(default_factory=dict)
+
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> Self:
         raise NotImplementedError  # pragma: no cover
 
-    def generate(self, context: Dict[str, Any]) -> Any:
-        if self.is_recursive:
-            context["state"]["__depth__"] += 1
+    def model_post_init(self, __context: Any) -> None:
+        # Nodes without a path are only validated, not generated from, by the parser
+        if self.path is not None:
+            self._code = self._compile_expressions()
 
+    def _compile_expressions(self) -> Dict[str, Any]:
+        code = {}
+        if self.provider is not None:
+            code["$provider"] = compile_expression(self.provider, self.path, "$provider")
         if self.set_state is not None:
-            context["state"][self.path] = {k: eval(v, context)() for k, v in self.set_state.items()}
+            code["$state"] = {
+                k: compile_expression(v, self.path, f"$state/{k}")
+                for k, v in self.set_state.items()
+            }
+        return code
+
+    def __getstate__(self) -> Dict[Any, Any]:
+        # Compiled closures and code objects can't be pickled, they are rebuilt on first use instead
+        state = super().__getstate__()
+        state["__pydantic_private__"] = {
+            **state["__pydantic_private__"],
+            "_generator": None,
+            "_code": {},
+        }
+        return state
+
+    def generate(self, context: Dict[str, Any]) -> Any:
+        return (self._generator or self.compile())(context)
+
+    def compile(self, compiled: Optional[Compiled] = None) -> GenerateFn:
+        """Builds a function generating values for this node, with every check
+        that only depends on the schema (provider, default, examples,
+        nullability, state) resolved once up front.
+
+        Args:
+            compiled (Compiled, optional): Functions already compiled for the current tree,
+                keyed by node id. Used to share work between references and to close cycles in
+                recursive schemas. Its hook, if any, wraps the function compiled for every node.
+        """
+        is_root = compiled is None
+        compiled = Compiled() if compiled is None else compiled
+        key = id(self)
+        if key in compiled:
+            fn = compiled[key]
+            # A node still being compiled further up the stack is a recursive reference
+            return fn if fn is not None else lambda context: compiled[key](context)
+
+        compiled[key] = None
+        if not self._code:
+            self._code = self._compile_expressions()
+        fn = self._compile_base(self._compile_value(compiled))
+        if compiled.hook is not None:
+            fn = compiled.hook(self, fn)
+        compiled[key] = fn
+        if is_root:
+            self._generator = fn
+        return fn
+
+    def _compile_value(self, compiled: Compiled) -> GenerateFn:
+        raise NotImplementedError  # pragma: no cover
 
-        if self.is_nullable and (
-            random.uniform(0, 1) < self.allow_none_optionals
-            or context["state"]["__depth__"] > self.max_recursive_depth
-        ):
+    def domain_size(self) -> Optional[int]:
+        """The number of distinct values the node can generate, or None when
+        it isn't known to be finite."""
+        if self.provider is not None:
             return None
+        size = self._domain_size()
+        return size + 1 if size is not None and self.is_nullable else size
+
+    def _domain_size(self) -> Optional[int]:
+        return None
+
+    def _coerce(self, value: Any) -> Any:
+        """Conversion applied to provided, default and example values."""
+        return value
+
+    def _compile_base(self, generate_value: GenerateFn) -> GenerateFn:
+        fn = generate_value
+        coerce = self._coerce
+
         if self.provider is not None:
-            return eval(self.provider, context)()
+            path, provider = self.path, self._code["$provider"]
+
+            def provided(context: Dict[str, Any]) -> Any:
+                value = eval(provider, context)()
+                if not hasattr(value, "__await__"):
+                    return coerce(value)
+                pending = context.get("__pending__")
+                if pending is None:
+                    getattr(value, "close", lambda: None)()  # Don't warn it was never awaited
+                    raise ValueError(
+                        f"The $provider at {path} is asynchronous, "
+                        "use agenerate or aiter_generate instead"
+                    )
+                pending.append(Pending(value, coerce))
+                return pending[-1]
+
+            fn = provided
+
+        elif self.default or self.examples:
+            default, examples = self.default, self.examples
+
+            def preferred(context: Dict[str, Any]) -> Any:
+                if context.get("use_defaults", False) and default:
+                    return coerce(default)
+                if context.get("use_examples", False) and examples:
+                    return coerce(context["random"].choice(examples))
+                return generate_value(context)
+
+            fn = preferred
+
+        if self.is_nullable:
+            not_null = fn
+            allow_none, max_depth = self.allow_none_optionals, self.max_recursive_depth
+
+            def nullable(context: Dict[str, Any]) -> Any:
+                if (
+                    context["random"].uniform(0, 1) < allow_none
+                    or context["state"]["__depth__"] > max_depth
+                ):
+                    return None
+                return not_null(context)
+
+            fn = nullable
+
+        if self.set_state is not None:
+            stateless = fn
+            path, set_state = self.path, self._code["$state"]
+
+            def stateful(context: Dict[str, Any]) -> Any:
+                context["state"][path] = {k: eval(v, context)() for k, v in set_state.items()}
+                return stateless(context)
+
+            fn = stateful
+
+        if self.unique:
+            repeatable = fn
+            path, domain_size = self.path, self.domain_size()
+
+            def unique(context: Dict[str, Any]) -> Any:
+                index = context["state"]["__unique__"][path]
+                for _ in range(MAX_UNIQUE_RETRIES):
+                    if domain_size is not None and index.count >= domain_size:
+                        break
+                    value = repeatable(context)
+                    if value is None or index.add(value):
+                        return value
+                raise ValueError(f"Could not generate another unique value at {path}")
+
+            fn = unique
+
+        if self.is_recursive:
+            shallow = fn
 
-        if context.get("use_defaults", False) and self.default:
-            return self.default
+            def recursive(context: Dict[str, Any]) -> Any:
+                context["state"]["__depth__"] += 1
+                return shallow(context)
 
-        if context.get("use_examples", False) and self.examples:
-            return random.choice(self.examples)
+            fn = recursive
 
-        raise ProviderNotSetException()
+        return fn
 
     def model(self, context: Dict[str, Any]) -> Optional[Tuple[Type, Field]]:
         raise NotImplementedError  # pragma: no cover
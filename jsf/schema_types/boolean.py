@@ -1,15 +1,15 @@
-import random
 from typing import Any, Dict, Optional, Tuple, Type
 
-from jsf.schema_types.base import BaseSchema, ProviderNotSetException
+from jsf.schema_types.base import BaseSchema, Compiled, GenerateFn
 
 
 class Boolean(BaseSchema):
-    def generate(self, context: Dict[str, Any]) -> Optional[bool]:
-        try:
-            return super().generate(context)
-        except ProviderNotSetException:
-            return random.choice([True, False])
+    def _compile_value(self, compiled: Compiled) -> GenerateFn:
+        values = (True, False)
+        return lambda context: context["random"].choice(values)
+
+    def _domain_size(self) -> Optional[int]:
+        return 2
 
     def model(self, context: Dict[str, Any]) -> Tuple[Type, Any]:
         return self.to_pydantic(context, bool)
@@ -1,11 +1,10 @@
 import logging
-import random
 from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple, Type, Union
 
 from pydantic import ConfigDict
 
-from jsf.schema_types.base import BaseSchema, ProviderNotSetException
+from jsf.schema_types.base import BaseSchema, Compiled, GenerateFn, freeze
 
 logger = logging.getLogger()
 _types = {"string": str, "integer": int, "number": float}
@@ -15,11 +14,12 @@ class JSFEnum(BaseSchema):
     enum: Optional[List[Union[str, int, float, dict, None]]] = []
     model_config = ConfigDict()
 
-    def generate(self, context: Dict[str, Any]) -> Optional[Union[str, int, float]]:
-        try:
-            return super().generate(context)
-        except ProviderNotSetException:
-            return random.choice(self.enum)
+    def _compile_value(self, compiled: Compiled) -> GenerateFn:
+        values = self.enum
+        return lambda context: context["random"].choice(values)
+
+    def _domain_size(self) -> Optional[int]:
+        return len({freeze(v) for v in self.enum or []})
 
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "JSFEnum":
@@ -1,14 +1,14 @@
-from typing import Any, Dict, Tuple, Type
+from typing import Any, Dict, Optional, Tuple, Type
 
-from jsf.schema_types.base import BaseSchema, ProviderNotSetException
+from jsf.schema_types.base import BaseSchema, Compiled, GenerateFn
 
 
 class Null(BaseSchema):
-    def generate(self, context: Dict[str, Any]) -> None:
-        try:
-            return super().generate(context)
-        except ProviderNotSetException:
-            return None
+    def _compile_value(self, compiled: Compiled) -> GenerateFn:
+        return lambda context: None
+
+    def _domain_size(self) -> Optional[int]:
+        return 1
 
     def model(self, context: Dict[str, Any]) -> Tuple[Type, Any]:
         return self.to_pydantic(context, type(None))
@@ -1,8 +1,7 @@
 import math
-import random
 from typing import Any, Dict, Optional, Tuple, Type, Union
 
-from jsf.schema_types.base import BaseSchema, ProviderNotSetException
+from jsf.schema_types.base import BaseSchema, Compiled, GenerateFn
 
 
 class Number(BaseSchema):
@@ -13,29 +12,32 @@ class Number(BaseSchema):
     exclusiveMaximum: Optional[Union[bool, float, int]] = None
     # enum: List[Union[str, int, float]] = None  # NOTE: Not used - enums go to enum class
 
-    def generate(self, context: Dict[str, Any]) -> Optional[float]:
-        try:
-            return super().generate(context)
-        except ProviderNotSetException:
-            step = self.multipleOf if self.multipleOf is not None else 1
-
-            if isinstance(self.exclusiveMinimum, bool):
-                _min = self.minimum + step
-            elif isinstance(self.exclusiveMinimum, (int, float)):
-                _min = self.exclusiveMinimum + step
-            else:
-                _min = self.minimum
-
-            if isinstance(self.exclusiveMaximum, bool):
-                _max = self.maximum - step
-            elif isinstance(self.exclusiveMaximum, (int, float)):
-                _max = self.exclusiveMaximum - step
-            else:
-                _max = self.maximum
-
-            return float(
-                step * random.randint(math.ceil(float(_min) / step), math.floor(float(_max) / step))
-            )
+    def _bounds(self) -> Tuple[Union[float, int], int, int]:
+        step = self.multipleOf if self.multipleOf is not None else 1
+
+        if isinstance(self.exclusiveMinimum, bool):
+            _min = self.minimum + step
+        elif isinstance(self.exclusiveMinimum, (int, float)):
+            _min = self.exclusiveMinimum + step
+        else:
+            _min = self.minimum
+
+        if isinstance(self.exclusiveMaximum, bool):
+            _max = self.maximum - step
+        elif isinstance(self.exclusiveMaximum, (int, float)):
+            _max = self.exclusiveMaximum - step
+        else:
+            _max = self.maximum
+
+        return step, math.ceil(float(_min) / step), math.floor(float(_max) / step)
+
+    def _compile_value(self, compiled: Compiled) -> GenerateFn:
+        step, low, high = self._bounds()
+        return lambda context: float(step * context["random"].randint(low, high))
+
+    def _domain_size(self) -> Optional[int]:
+        _, low, high = self._bounds()
+        return max(high - low + 1, 0)
 
     def model(self, context: Dict[str, Any]) -> Tuple[Type, Any]:
         return self.to_pydantic(context, float)
@@ -46,9 +48,12 @@ class Number(BaseSchema):
 
 
 class Integer(Number):
-    def generate(self, context: Dict[str, Any]) -> Optional[int]:
-        n = super().generate(context)
-        return int(n) if n is not None else n
+    def _compile_value(self, compiled: Compiled) -> GenerateFn:
+        step, low, high = self._bounds()
+        return lambda context: int(step * context["random"].randint(low, high))
+
+    def _coerce(self, value: Any) -> Optional[int]:
+        return int(value) if value is not None else value
 
     def model(self, context: Dict[str, Any]) -> Tuple[Type, Any]:
         return self.to_pydantic(context, int)
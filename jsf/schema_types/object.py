@@ -1,11 +1,10 @@
 import logging
-import random
 from typing import Any, Dict, List, Optional, Tuple, Type, Union
 
-import rstr
 from pydantic import BaseModel, create_model
 
-from jsf.schema_types.base import BaseSchema, ProviderNotSetException
+from jsf.schema_types.base import BaseSchema, Compiled, GenerateFn
+from jsf.schema_types.string_utils.regex import compile_regex
 
 logger = logging.getLogger()
 
@@ -36,27 +35,40 @@ class Object(BaseSchema):
         if isinstance(self.required, list) and property_name in self.required:
             return True
         return (
-            random.uniform(0, 1) > self.allow_none_optionals
+            context["random"].uniform(0, 1) > self.allow_none_optionals
             and context["state"]["__depth__"] <= self.max_recursive_depth
         )
 
-    def generate(self, context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        try:
-            return super().generate(context)
-        except ProviderNotSetException:
+    def _compile_value(self, compiled: Compiled) -> GenerateFn:
+        required = set(self.required) if isinstance(self.required, list) else set()
+        properties = [(o.name, o.name in required, o.compile(compiled)) for o in self.properties]
+        pattern_properties = [
+            (compile_regex(o.name), o.name in required, o.compile(compiled))
+            for o in (self.patternProperties or [])
+        ]
+        allow_none, max_depth = self.allow_none_optionals, self.max_recursive_depth
+
+        def generate(context: Dict[str, Any]) -> Dict[str, Any]:
+            state, rng = context["state"], context["random"]
             explicit_properties = {
-                o.name: o.generate(context)
-                for o in self.properties
-                if self.should_keep(o.name, context)
+                name: fn(context)
+                for name, is_required, fn in properties
+                if is_required
+                or (rng.uniform(0, 1) > allow_none and state["__depth__"] <= max_depth)
             }
+            if not pattern_properties:
+                return explicit_properties
             pattern_props = {}
-            if self.patternProperties:
-                for o in self.patternProperties:
-                    for _ in range(random.randint(0, 10)):
-                        if self.should_keep(o.name, context):
-                            pattern_props[rstr.xeger(o.name)] = o.generate(context)
+            for xeger, is_required, fn in pattern_properties:
+                for _ in range(rng.randint(0, 10)):
+                    if is_required or (
+                        rng.uniform(0, 1) > allow_none and state["__depth__"] <= max_depth
+                    ):
+                        pattern_props[xeger(rng)] = fn(context)
             return {**pattern_props, **explicit_properties}
 
+        return generate
+
     def model(self, context: Dict[str, Any]) -> Tuple[Type, Any]:
         self.generate(context)
         name = self._get_unique_name(context)
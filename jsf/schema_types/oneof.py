@@ -1,7 +1,6 @@
-import random
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List
 
-from jsf.schema_types.base import BaseSchema, ProviderNotSetException
+from jsf.schema_types.base import BaseSchema, Compiled, GenerateFn
 
 
 class OneOf(BaseSchema):
@@ -11,14 +10,17 @@ class OneOf(BaseSchema):
     def from_dict(cls, d: Dict[str, Any]) -> "OneOf":
         return OneOf(**d)
 
-    def generate(self, context: Dict[str, Any]) -> Optional[List[Any]]:
-        try:
-            return super().generate(context)
-        except ProviderNotSetException:
-            filtered_schemas = []
-            if context["state"]["__depth__"] > self.max_recursive_depth:
-                filtered_schemas = [schema for schema in self.schemas if not schema.is_recursive]
-            return random.choice(filtered_schemas or self.schemas).generate(context)
+    def _compile_value(self, compiled: Compiled) -> GenerateFn:
+        schemas = [schema.compile(compiled) for schema in self.schemas]
+        non_recursive = [fn for schema, fn in zip(self.schemas, schemas) if not schema.is_recursive]
+        max_depth = self.max_recursive_depth
+
+        def generate(context: Dict[str, Any]) -> Any:
+            if context["state"]["__depth__"] > max_depth:
+                return context["random"].choice(non_recursive or schemas)(context)
+            return context["random"].choice(schemas)(context)
+
+        return generate
 
     def model(self, context: Dict[str, Any]) -> None:
         pass
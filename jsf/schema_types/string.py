@@ -2,17 +2,15 @@ import logging
 import random
 import re
 from datetime import timezone
-from typing import Any, Callable, Dict, Optional, Tuple, Type
+from random import Random
+from typing import Any, Callable, Dict, Optional, Tuple, Type, cast
 
-import rstr
-from faker import Faker
-
-from jsf.schema_types.base import BaseSchema, ProviderNotSetException
+from jsf.schema_types.base import BaseSchema, Compiled, GenerateFn
 from jsf.schema_types.string_utils import content_encoding, content_type
 from jsf.schema_types.string_utils.content_type.text__plain import random_fixed_length_sentence
+from jsf.schema_types.string_utils.regex import compile_regex
 
 logger = logging.getLogger()
-faker = Faker()
 
 FRAGMENT = "[a-zA-Z][a-zA-Z0-9+-.]*"
 URI_PATTERN = f"https?://{{hostname}}(?:{FRAGMENT})+"
@@ -67,52 +65,68 @@ def temporal_duration(
     return duration
 
 
-def mostly_zero_randint(_min: int, _max: int) -> int:
-    return 0 if random.random() > 0.8 else random.randint(int(_min), int(_max))
+def mostly_zero_randint(_min: int, _max: int, rng: Random = cast(Random, random)) -> int:
+    return 0 if rng.random() > 0.8 else rng.randint(int(_min), int(_max))
 
 
-def fake_duration() -> str:
+def fake_duration(rng: Random = cast(Random, random)) -> str:
     generic_max = 1000
     return temporal_duration(
-        positive=random.random() > 0.5,
-        years=mostly_zero_randint(0, generic_max),
-        months=mostly_zero_randint(0, generic_max),
-        weeks=mostly_zero_randint(0, generic_max),
-        days=mostly_zero_randint(0, generic_max),
-        hours=mostly_zero_randint(0, generic_max),
-        minutes=mostly_zero_randint(0, generic_max),
-        seconds=mostly_zero_randint(0, generic_max),
-        milliseconds=mostly_zero_randint(0, 999),
-        microseconds=mostly_zero_randint(0, 999),
-        nanoseconds=mostly_zero_randint(0, 999),
+        positive=rng.random() > 0.5,
+        years=mostly_zero_randint(0, generic_max, rng),
+        months=mostly_zero_randint(0, generic_max, rng),
+        weeks=mostly_zero_randint(0, generic_max, rng),
+        days=mostly_zero_randint(0, generic_max, rng),
+        hours=mostly_zero_randint(0, generic_max, rng),
+        minutes=mostly_zero_randint(0, generic_max, rng),
+        seconds=mostly_zero_randint(0, generic_max, rng),
+        milliseconds=mostly_zero_randint(0, 999, rng),
+        microseconds=mostly_zero_randint(0, 999, rng),
+        nanoseconds=mostly_zero_randint(0, 999, rng),
     )
 
 
-format_map: Dict[str, Callable] = {
-    "date-time": lambda: faker.date_time(timezone.utc).isoformat(),
-    "time": lambda: faker.date_time(timezone.utc).isoformat().split("T")[1],
-    "date": lambda: faker.date_time(timezone.utc).isoformat().split("T")[0],
-    "duration": fake_duration,
-    "email": faker.email,
-    "idn-email": faker.email,
-    "hostname": faker.hostname,
-    "idn-hostname": faker.hostname,
-    "ipv4": faker.ipv4,
-    "ipv6": faker.ipv6,
-    "uri": faker.uri,
-    "uri-reference": lambda: faker.uri() + rstr.xeger(PARAM_PATTERN),
-    "iri": faker.uri,
-    "iri-reference": lambda: faker.uri() + rstr.xeger(PARAM_PATTERN),
-    "uri-template": lambda: rstr.xeger(
-        URI_PATTERN.format(hostname=re.escape(faker.hostname())).replace(
-            "(?:", "(?:/\\{[a-z][:a-zA-Z0-9-]*\\}|"
-        )
+param_xeger = compile_regex(PARAM_PATTERN)
+# The hostname is substituted after generation, so that the template pattern is only compiled once
+HOSTNAME_PLACEHOLDER = "\x00"
+uri_template_xeger = compile_regex(
+    URI_PATTERN.format(hostname=re.escape(HOSTNAME_PLACEHOLDER)).replace(
+        "(?:", "(?:/\\{[a-z][:a-zA-Z0-9-]*\\}|"
+    )
+)
+json_pointer_xeger = compile_regex(f"(/(?:${FRAGMENT.replace(']*', '/]*')}|~[01]))+")
+
+
+def fake_date_time(context: Dict[str, Any]) -> str:
+    # Dates are drawn up to now, or the instant seeded generation takes as now
+    end = context.get("__now__")
+    return context["faker"].date_time(timezone.utc, end_datetime=end).isoformat()
+
+
+# Each format generator takes the generation context, and draws from its "faker" and "random"
+format_map: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    "date-time": fake_date_time,
+    "time": lambda c: fake_date_time(c).split("T")[1],
+    "date": lambda c: fake_date_time(c).split("T")[0],
+    "duration": lambda c: fake_duration(c["random"]),
+    "email": lambda c: c["faker"].email(),
+    "idn-email": lambda c: c["faker"].email(),
+    "hostname": lambda c: c["faker"].hostname(),
+    "idn-hostname": lambda c: c["faker"].hostname(),
+    "ipv4": lambda c: c["faker"].ipv4(),
+    "ipv6": lambda c: c["faker"].ipv6(),
+    "uri": lambda c: c["faker"].uri(),
+    "uri-reference": lambda c: c["faker"].uri() + param_xeger(c["random"]),
+    "iri": lambda c: c["faker"].uri(),
+    "iri-reference": lambda c: c["faker"].uri() + param_xeger(c["random"]),
+    "uri-template": lambda c: uri_template_xeger(c["random"]).replace(
+        HOSTNAME_PLACEHOLDER, c["faker"].hostname()
     ),
-    "json-pointer": lambda: rstr.xeger(f"(/(?:${FRAGMENT.replace(']*', '/]*')}|~[01]))+"),
-    "relative-json-pointer": lambda: rstr.xeger(
-        f"(/(?:${FRAGMENT.replace(']*', '/]*')}|~[01]))+"
+    "json-pointer": lambda c: json_pointer_xeger(c["random"]),
+    "relative-json-pointer": lambda c: json_pointer_xeger(
+        c["random"]
     ),  # NOTE: Would need access to whole root object to mock properly
-    "uuid": faker.uuid4,
+    "uuid": lambda c: c["faker"].uuid4(),
 }
 
 
@@ -126,27 +140,72 @@ class String(BaseSchema):
     contentEncoding: Optional[content_encoding.ContentEncoding] = None
     # contentSchema # Doesnt help with generation
 
-    def generate(self, context: Dict[str, Any]) -> Optional[str]:
-        try:
-            s = super().generate(context)
-            return str(content_encoding.encode(s, self.contentEncoding)) if s else s
-        except ProviderNotSetException:
-            format_map["regex"] = lambda: rstr.xeger(self.pattern)
-            format_map["relative-json-pointer"] = lambda: random.choice(
-                context["state"]["__all_json_paths__"]
+    def _compile_raw(self) -> GenerateFn:
+        if self.format == "regex":
+            generate = compile_regex(self.pattern)
+            return lambda context: generate(context["random"])
+        if self.format == "relative-json-pointer":
+            return lambda context: context["random"].choice(context["state"]["__all_json_paths__"])
+        if format_map.get(self.format) is not None:
+            return format_map[self.format]
+        if self.pattern is not None:
+            generate = compile_regex(self.pattern)
+            return lambda context: generate(context["random"])
+        if self.contentMediaType is not None:
+            # The default lengths suit text, binary media types have their own default sizes
+            media_type = self.contentMediaType
+            min_length = self.minLength if "minLength" in self.model_fields_set else None
+            max_length = self.maxLength if "maxLength" in self.model_fields_set else None
+            # The lengths bound the encoded string, the content is bounded so that it encodes
+            # within them
+            min_length, max_length = content_encoding.byte_bounds(
+                min_length,
+                max_length,
+                self.contentEncoding,
+                binary=media_type in content_type.BinaryContentTypes,
             )
-            if format_map.get(self.format) is not None:
-                return content_encoding.encode(format_map[self.format](), self.contentEncoding)
-            if self.pattern is not None:
-                return content_encoding.encode(rstr.xeger(self.pattern), self.contentEncoding)
-            if self.contentMediaType is not None:
-                return content_encoding.encode(
-                    content_type.generate(self.contentMediaType, self.minLength, self.maxLength),
-                    self.contentEncoding,
-                )
-            return content_encoding.encode(
-                random_fixed_length_sentence(self.minLength, self.maxLength), self.contentEncoding
+            return lambda context: content_type.generate(
+                media_type, min_length, max_length, context["random"], context.get("__now__")
+            )
+        min_length, max_length = self.minLength, self.maxLength
+        if self.contentEncoding is not None:
+            min_length, max_length = content_encoding.byte_bounds(
+                min_length, max_length, self.contentEncoding, binary=False
             )
+        return lambda context: random_fixed_length_sentence(
+            min_length, max_length, context["random"]
+        )
+
+    def _compile_value(self, compiled: Compiled) -> GenerateFn:
+        generate = self._compile_raw()
+        if self.contentEncoding is None and self.contentMediaType is None:
+            return generate
+        # Binary media types are generated as bytes, which are only turned into a string here
+        encoding = self.contentEncoding
+        media_type = self.contentMediaType
+        if (
+            "maxLength" not in self.model_fields_set
+            or media_type not in content_type.BinaryContentTypes
+        ):
+            return lambda context: content_encoding.encode(generate(context), encoding)
+
+        path, max_length = self.path, self.maxLength
+        encoding_name = "escaped bytes" if encoding is None else encoding.value
+
+        def encoded(context: Dict[str, Any]) -> str:
+            value = content_encoding.encode(generate(context), encoding)
+            if len(value) > max_length:
+                # Binary media types can't be made smaller than their headers
+                raise ValueError(
+                    f"Could not generate {media_type} content of at most {max_length} "
+                    f"characters as {encoding_name} at {path}"
+                )
+            return value
+
+        return encoded
+
+    def _coerce(self, value: Any) -> Optional[str]:
+        return str(content_encoding.encode(value, self.contentEncoding)) if value else value
 
     def model(self, context: Dict[str, Any]) -> Tuple[Type, Any]:
         return self.to_pydantic(context, str)
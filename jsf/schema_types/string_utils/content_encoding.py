@@ -1,6 +1,9 @@
 import base64
-import quopri
+import binascii
 from enum import Enum
+from typing import Optional, Tuple, Union
+
+Content = Union[str, bytes]
 
 
 class ContentEncoding(str, Enum):
@@ -13,36 +16,46 @@ class ContentEncoding(str, Enum):
     BASE64 = "base-64"
 
 
-def binary_encoder(string: str) -> str:
-    return "".join(format(x, "b") for x in bytearray(string, "utf-8"))
+# The binary digits of every byte value
+BINARY_DIGITS = tuple(format(x, "b") for x in range(256))
+
+
+def to_bytes(content: Content) -> bytes:
+    return content.encode("utf-8") if isinstance(content, str) else content
+
+
+def binary_encoder(content: Content) -> str:
+    return "".join(map(BINARY_DIGITS.__getitem__, to_bytes(content)))
 
 
 def bytes_str_repr(b: bytes) -> str:
     return repr(b)[2:-1]
 
 
-def seven_bit_encoder(string: str) -> str:
-    return bytes_str_repr(string.encode("utf-7"))
+def seven_bit_encoder(content: Content) -> str:
+    if isinstance(content, str):
+        content = content.encode("utf-7")
+    return bytes_str_repr(content)
 
 
-def eight_bit_encoder(string: str) -> str:
-    return bytes_str_repr(string.encode("utf-8"))
+def eight_bit_encoder(content: Content) -> str:
+    return bytes_str_repr(to_bytes(content))
 
 
-def quoted_printable_encoder(string: str) -> str:
-    return bytes_str_repr(quopri.encodestring(string.encode("utf-8")))
+def quoted_printable_encoder(content: Content) -> str:
+    return binascii.b2a_qp(to_bytes(content)).decode("ascii")
 
 
-def b16_encoder(string: str) -> str:
-    return bytes_str_repr(base64.b16encode(string.encode("utf-8")))
+def b16_encoder(content: Content) -> str:
+    return base64.b16encode(to_bytes(content)).decode("ascii")
 
 
-def b32_encoder(string: str) -> str:
-    return bytes_str_repr(base64.b32encode(string.encode("utf-8")))
+def b32_encoder(content: Content) -> str:
+    return base64.b32encode(to_bytes(content)).decode("ascii")
 
 
-def b64_encoder(string: str) -> str:
-    return bytes_str_repr(base64.b64encode(string.encode("utf-8")))
+def b64_encoder(content: Content) -> str:
+    return binascii.b2a_base64(to_bytes(content), newline=False).decode("ascii")
 
 
 Encoder = {
@@ -56,5 +69,56 @@ Encoder = {
 }
 
 
-def encode(string: str, encoding: ContentEncoding) -> str:
-    return Encoder.get(encoding, lambda s: s)(string)
+# The characters and bytes of each block of the encodings that turn blocks of bytes into blocks of
+# characters
+BLOCKS = {
+    ContentEncoding.BASE16: (2, 1),
+    ContentEncoding.BASE32: (8, 5),
+    ContentEncoding.BASE64: (4, 3),
+}
+# The most characters any byte takes once encoded by the other encodings, escapes and soft line
+# breaks included
+MAX_EXPANSION = {
+    ContentEncoding.SEVEN_BIT: 4,
+    ContentEncoding.EIGHT_BIT: 4,
+    ContentEncoding.BINARY: 8,
+    ContentEncoding.QUOTED_PRINTABLE: 4,
+    None: 4,
+}
+
+
+def byte_bounds(
+    min_length: Optional[int],
+    max_length: Optional[int],
+    encoding: Optional[ContentEncoding],
+    binary: bool = True,
+) -> Tuple[Optional[int], Optional[int]]:
+    """Converts bounds on the length of encoded content into bounds on the
+    length of the content to encode, so that content within them encodes
+    within the original bounds. Text content is assumed to be ASCII, which
+    only the binary and quoted-printable encodings expand, and keeps its
+    original bounds when no length of text can encode within them."""
+    if encoding in BLOCKS:
+        chars, size = BLOCKS[encoding]
+        low = None if min_length is None else -(-min_length // chars) * size
+        high = None if max_length is None else max_length // chars * size
+    else:
+        expansion = 1
+        if binary or encoding in (ContentEncoding.BINARY, ContentEncoding.QUOTED_PRINTABLE):
+            expansion = MAX_EXPANSION[encoding]
+        low, high = min_length, None if max_length is None else max_length // expansion
+    if low is not None and high is not None and low > high:
+        if not binary:
+            return min_length, max_length
+        low = high
+    return low, high
+
+
+def encode(content: Content, encoding: Optional[ContentEncoding]) -> str:
+    """Encodes text or binary content into a string, converting binary
+    content only once. Binary content without an encoding is escaped like a
+    bytes literal."""
+    encoder = Encoder.get(encoding)
+    if encoder is not None:
+        return encoder(content)
+    return bytes_str_repr(content) if isinstance(content, bytes) else content
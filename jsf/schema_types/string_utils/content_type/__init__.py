@@ -1,8 +1,20 @@
+import random
+from datetime import datetime
+from random import Random
+from typing import Dict, Optional, Union, cast
+
+from jsf.schema_types.string_utils.content_type import (
+    application__gzip,
+    application__zip,
+    image__jpeg,
+    image__webp,
+)
 from jsf.schema_types.string_utils.content_type.application__gzip import create_random_gzip
 from jsf.schema_types.string_utils.content_type.application__jwt import create_random_jwt
 from jsf.schema_types.string_utils.content_type.application__zip import create_random_zip
 from jsf.schema_types.string_utils.content_type.image__jpeg import random_jpg
 from jsf.schema_types.string_utils.content_type.image__webp import random_webp
+from jsf.schema_types.string_utils.content_type.pool import BlobPool
 from jsf.schema_types.string_utils.content_type.text__plain import random_fixed_length_sentence
 
 
@@ -10,6 +22,14 @@ def not_implemented(*args, **kwargs):
     raise NotImplementedError()
 
 
+def random_text(
+    min_length: Optional[int], max_length: Optional[int], rng: Random = cast(Random, random)
+) -> str:
+    return random_fixed_length_sentence(
+        min_length or 0, 50 if max_length is None else max_length, rng=rng
+    )
+
+
 ContentTypeGenerator = {
     "application/jwt": create_random_jwt,
     # "text/html": not_implemented,
@@ -23,7 +43,7 @@ ContentTypeGenerator = {
     # "text/javascript": not_implemented,
     # "image/png": not_implemented, # To implement: request jpg and convert to png
     # "image/tiff": not_implemented, # To implement: request jpg and convert to tiff
-    "text/plain": random_fixed_length_sentence,
+    "text/plain": random_text,
     "image/webp": random_webp,
     "application/zip": create_random_zip,
     "application/gzip": create_random_gzip,
@@ -33,6 +53,32 @@ ContentTypeGenerator = {
     # "text/calendar": not_implemented,
 }
 
+# The pools binary payloads are drawn from, which can be resized or disabled with `configure`
+BlobPools: Dict[str, BlobPool] = {
+    "image/jpeg": image__jpeg.pool,
+    "image/webp": image__webp.pool,
+    "application/zip": application__zip.pool,
+    "application/gzip": application__gzip.pool,
+}
+
+# Media types generated as bytes rather than text
+BinaryContentTypes = frozenset(BlobPools)
+# Media types whose content depends on the current time, which `generate` passes them as now
+TimedContentTypes = frozenset({"application/jwt"})
+
 
-def generate(content_type: str, min_length: int, max_length: int) -> str:
-    return ContentTypeGenerator.get(content_type, not_implemented)(min_length, max_length)
+def generate(
+    content_type: str,
+    min_length: Optional[int] = None,
+    max_length: Optional[int] = None,
+    rng: Random = cast(Random, random),
+    now: Optional[datetime] = None,
+) -> Union[str, bytes]:
+    """Generates content of the given media type, as text or as bytes for
+    binary media types. Each media type picks its own size for the bounds
+    that aren't given, and timed media types take now, if given, as the
+    current time."""
+    generator = ContentTypeGenerator.get(content_type, not_implemented)
+    if content_type in TimedContentTypes:
+        return generator(min_length, max_length, rng=rng, now=now)
+    return generator(min_length, max_length, rng=rng)
@@ -1,16 +1,67 @@
-import gzip
-import io
+import random
+import struct
+import zlib
+from random import Random
+from typing import Optional, cast
 
-from jsf.schema_types.string_utils.content_encoding import bytes_str_repr
-from jsf.schema_types.string_utils.content_type.application__zip import create_random_file_name
+from jsf.schema_types.string_utils.content_type.application__zip import (
+    create_random_file_name,
+    filler_text,
+)
+from jsf.schema_types.string_utils.content_type.pool import BlobPool
 from jsf.schema_types.string_utils.content_type.text__plain import random_fixed_length_sentence
 
+FNAME, FCOMMENT = 0x08, 0x10
 
-def create_random_gzip(*args, **kwargs) -> str:
-    fgz = io.BytesIO()
-    gzip_obj = gzip.GzipFile(filename=create_random_file_name(), mode="wb", fileobj=fgz)
-    gzip_obj.write(random_fixed_length_sentence().encode("utf-8"))
-    gzip_obj.close()
 
-    fgz.seek(0)
-    return bytes_str_repr(fgz.getvalue())
+def _gzip(name: bytes, data: bytes, mtime: int, comment: int = 0) -> bytes:
+    flags = FNAME | (FCOMMENT if comment else 0)
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return b"".join(
+        [
+            struct.pack("<BBBBIBB", 0x1F, 0x8B, 8, flags, mtime, 2, 255),
+            name + b"\x00",
+            # The comment, and its terminating null byte, pad the member to a given size
+            filler_text(comment - 1) + b"\x00" if comment else b"",
+            compressor.compress(data) + compressor.flush(),
+            struct.pack("<II", zlib.crc32(data), len(data) & 0xFFFFFFFF),
+        ]
+    )
+
+
+def render_gzip(
+    min_length: Optional[int] = None,
+    max_length: Optional[int] = None,
+    rng: Random = cast(Random, random),
+) -> bytes:
+    """Compresses a random text file with gzip, sized to fit between
+    min_length and max_length bytes when possible.
+
+    The text is shortened until the member fits under max_length, and a
+    short member is padded up to min_length with a comment.
+    """
+    name = create_random_file_name(rng).encode("latin-1")
+    text = random_fixed_length_sentence(rng=rng).encode("utf-8")
+    mtime = rng.randint(0, 2**31 - 1)
+    member = _gzip(name, text, mtime)
+    while max_length is not None and len(member) > max_length and (text or len(name) > 1):
+        if text:
+            text = text[: len(text) // 2]
+        else:
+            name = name[: len(name) // 2]
+        member = _gzip(name, text, mtime)
+
+    if min_length is not None and len(member) < min_length:
+        return _gzip(name, text, mtime, comment=min_length - len(member))
+    return member
+
+
+pool = BlobPool(render_gzip)
+
+
+def create_random_gzip(
+    min_length: Optional[int] = None,
+    max_length: Optional[int] = None,
+    rng: Random = cast(Random, random),
+) -> bytes:
+    return pool.draw(min_length, max_length, rng)
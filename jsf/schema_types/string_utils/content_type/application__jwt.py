@@ -2,12 +2,11 @@ import base64
 import hashlib
 import hmac
 import json
-import secrets
-from datetime import timezone
-
-from faker import Faker
-
-faker = Faker()
+import random
+import time
+from random import Random
+from datetime import datetime
+from typing import Optional, cast
 
 
 def base64url_encode(input: bytes) -> str:
@@ -37,10 +36,16 @@ def jwt(api_key: str, expiry: int, api_sec: str) -> str:
     return encoded_string
 
 
-def create_random_jwt(*args, **kwargs) -> str:
-    api_key = secrets.token_urlsafe(16)
-    api_sec = secrets.token_urlsafe(16)
+def random_token(rng: Random, nbytes: int = 16) -> str:
+    return base64url_encode(rng.getrandbits(nbytes * 8).to_bytes(nbytes, "big"))
+
+
+def create_random_jwt(
+    *args, rng: Random = cast(Random, random), now: Optional[datetime] = None, **kwargs
+) -> str:
+    api_key = random_token(rng)
+    api_sec = random_token(rng)
 
-    expiry = int(faker.date_time(timezone.utc).timestamp())
+    expiry = rng.randint(0, int(time.time() if now is None else now.timestamp()))
 
     return jwt(api_key, expiry, api_sec)
@@ -1,27 +1,90 @@
 import io
 import random
 import zipfile
-from typing import Tuple
+from random import Random
+from typing import List, Optional, Tuple, cast
 
-import rstr
+from jsf.schema_types.string_utils.content_type.pool import BlobPool
+from jsf.schema_types.string_utils.content_type.text__plain import (
+    LOREM,
+    random_fixed_length_sentence,
+)
+from jsf.schema_types.string_utils.regex import xeger
 
-from jsf.schema_types.string_utils.content_encoding import bytes_str_repr
-from jsf.schema_types.string_utils.content_type.text__plain import random_fixed_length_sentence
+# The bytes an empty archive takes, and each stored file on top of its name and data
+END_OF_ARCHIVE = 22
+FILE_OVERHEAD = 30 + 46
+MAX_COMMENT = 0xFFFF
+FILLER_NAME = "padding.txt"
+FILLER_TEXT = " ".join(LOREM).encode("utf-8")
 
 
-def create_random_file_name() -> str:
-    return rstr.xeger(r"[a-zA-Z0-9]+\.txt")
+def create_random_file_name(rng: Random = cast(Random, random)) -> str:
+    return xeger(r"[a-zA-Z0-9]+\.txt", rng)
 
 
-def create_random_file() -> Tuple[str, io.BytesIO]:
-    return (create_random_file_name(), io.BytesIO(random_fixed_length_sentence().encode("utf-8")))
+def create_random_file(rng: Random = cast(Random, random)) -> Tuple[str, io.BytesIO]:
+    return (
+        create_random_file_name(rng),
+        io.BytesIO(random_fixed_length_sentence(rng=rng).encode("utf-8")),
+    )
 
 
-def create_random_zip(*args, **kwargs) -> str:
-    zip_buffer = io.BytesIO()
+def filler_text(size: int) -> bytes:
+    """Text of exactly size bytes, built by repeating the lorem ipsum words."""
+    return (FILLER_TEXT * (size // len(FILLER_TEXT) + 1))[:size]
+
 
+def _zip(files: List[Tuple[str, bytes]], rng: Random, filler: int = 0, comment: int = 0) -> bytes:
+    zip_buffer = io.BytesIO()
+    date_time = (rng.randint(1980, 2030), rng.randint(1, 12), rng.randint(1, 28), 0, 0, 0)
     with zipfile.ZipFile(zip_buffer, "a", zipfile.ZIP_DEFLATED, False) as zip_file:
-        for file_name, data in [create_random_file() for _ in range(random.randint(1, 10))]:
-            zip_file.writestr(file_name, data.getvalue())
+        for file_name, data in files:
+            zip_file.writestr(zipfile.ZipInfo(file_name, date_time), data, zipfile.ZIP_DEFLATED)
+        if filler:
+            # Stored rather than compressed, so that its size is exact
+            info = zipfile.ZipInfo(FILLER_NAME, date_time)
+            zip_file.writestr(info, filler_text(filler), zipfile.ZIP_STORED)
+        zip_file.comment = b" " * comment
+    return zip_buffer.getvalue()
+
+
+def render_zip(
+    min_length: Optional[int] = None,
+    max_length: Optional[int] = None,
+    rng: Random = cast(Random, random),
+) -> bytes:
+    """Builds a zip archive of 1 to 10 random text files, sized to fit
+    between min_length and max_length bytes when possible.
+
+    Files are dropped until the archive fits under max_length, and short
+    archives are padded up to min_length with an archive comment, or a
+    stored filler file when more than a comment can hold is missing.
+    """
+    files = [
+        (name, data.getvalue())
+        for name, data in (create_random_file(rng) for _ in range(rng.randint(1, 10)))
+    ]
+    archive = _zip(files, rng)
+    while max_length is not None and len(archive) > max_length and files:
+        files.pop()
+        archive = _zip(files, rng)
+
+    missing = 0 if min_length is None else min_length - len(archive)
+    if missing <= 0:
+        return archive
+    filler_overhead = FILE_OVERHEAD + 2 * len(FILLER_NAME)
+    if missing <= MAX_COMMENT or missing < filler_overhead:
+        return _zip(files, rng, comment=missing)
+    return _zip(files, rng, filler=missing - filler_overhead)
+
+
+pool = BlobPool(render_zip)
+
 
-    return bytes_str_repr(zip_buffer.getvalue())
+def create_random_zip(
+    min_length: Optional[int] = None,
+    max_length: Optional[int] = None,
+    rng: Random = cast(Random, random),
+) -> bytes:
+    return pool.draw(min_length, max_length, rng)
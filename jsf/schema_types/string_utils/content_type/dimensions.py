@@ -0,0 +1,19 @@
+from random import Random
+from typing import Tuple
+
+# The smallest and largest size, in pixels, a dimension of an image is drawn between
+Dimension = Tuple[int, int]
+DEFAULT_DIMENSION: Dimension = (10, 500)
+
+
+def draw_dimensions(
+    width: Dimension, height: Dimension, max_dimension: int, rng: Random
+) -> Tuple[int, int]:
+    """Draws the width and height of an image from their ranges, which must
+    lie between 1 and max_dimension pixels."""
+    for name, (low, high) in (("width", width), ("height", height)):
+        if not 1 <= low <= high <= max_dimension:
+            raise ValueError(
+                f"Invalid image {name} range {low}-{high}, expected 1 <= min <= max <= {max_dimension}"
+            )
+    return rng.randint(*width), rng.randint(*height)
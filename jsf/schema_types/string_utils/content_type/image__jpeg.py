@@ -1,13 +1,163 @@
 import random
+import struct
+from functools import lru_cache
+from random import Random
+from typing import List, Optional, Tuple, cast
 
-import requests  # pants: no-infer-dep
+from jsf.schema_types.string_utils.content_type.dimensions import (
+    DEFAULT_DIMENSION,
+    Dimension,
+    draw_dimensions,
+)
+from jsf.schema_types.string_utils.content_type.pool import BlobPool
 
-from jsf.schema_types.string_utils.content_encoding import bytes_str_repr
+# Standard luminance DC table (ITU T.81 K.3), the number of codes of each length for categories 0-11
+DC_BITS = (0, 1, 5, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0)
+# Blocks are flat, the AC table only holds the end of block symbol
+AC_BITS = (1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+QUANTIZATION = 16
+# Upper bound on the bytes a block of the three components takes in the scan
+BLOCK_SIZE = 8
+MAX_SEGMENT = 0xFFFF - 2
+MAX_DIMENSION = 0xFFFF
 
 
-def random_jpg(*args, **kwargs) -> str:
-    return bytes_str_repr(
-        requests.get(
-            f"https://picsum.photos/{random.randint(1,50)*10}/{random.randint(1,50)*10}.jpg"
-        ).content
+def _segment(marker: int, payload: bytes) -> bytes:
+    return struct.pack(">BBH", 0xFF, marker, len(payload) + 2) + payload
+
+
+def _huffman_codes(bits: Tuple[int, ...]) -> List[str]:
+    codes, code = [], 0
+    for length, count in enumerate(bits, start=1):
+        for _ in range(count):
+            codes.append(format(code, f"0{length}b"))
+            code += 1
+        code <<= 1
+    return codes
+
+
+DC_CODES = _huffman_codes(DC_BITS)
+EOB = _huffman_codes(AC_BITS)[0]
+
+
+@lru_cache(maxsize=None)
+def _block_bits(diff: int) -> str:
+    """The bits coding a flat block, i.e. its DC difference and an end of
+    block."""
+    category = abs(diff).bit_length()
+    extra = diff if diff >= 0 else diff + (1 << category) - 1
+    return DC_CODES[category] + (format(extra, f"0{category}b") if category else "") + EOB
+
+
+def _headers(width: int, height: int) -> bytes:
+    return b"".join(
+        [
+            _segment(0xE0, b"JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"),
+            _segment(0xDB, b"\x00" + bytes([QUANTIZATION] * 64)),
+            _segment(
+                0xC0,
+                struct.pack(">BHHB", 8, height, width, 3)
+                + b"".join(bytes([component, 0x11, 0]) for component in (1, 2, 3)),
+            ),
+            _segment(
+                0xC4,
+                b"\x00" + bytes(DC_BITS) + bytes(range(12)) + b"\x10" + bytes(AC_BITS) + b"\x00",
+            ),
+        ]
     )
+
+
+SCAN_HEADER = _segment(0xDA, b"\x03\x01\x00\x02\x00\x03\x00\x00\x3f\x00")
+OVERHEAD = 2 + len(_headers(1, 1)) + len(SCAN_HEADER) + 2
+
+
+def _scan(columns: int, rows: int, rng: Random) -> bytes:
+    # A diagonal gradient between two random colours, with some noise
+    start = [rng.randint(0, 255) for _ in range(3)]
+    end = [rng.randint(0, 255) for _ in range(3)]
+    steps = max(columns + rows - 2, 1)
+    predictions = [0, 0, 0]
+    bits = []
+    for row in range(rows):
+        for column in range(columns):
+            t = (row + column) / steps
+            r, g, b = (s + (e - s) * t + rng.randint(-8, 8) for s, e in zip(start, end))
+            ycbcr = (
+                0.299 * r + 0.587 * g + 0.114 * b - 128,
+                -0.168736 * r - 0.331264 * g + 0.5 * b,
+                0.5 * r - 0.418688 * g - 0.081312 * b,
+            )
+            for component, value in enumerate(ycbcr):
+                dc = max(-127, min(127, round(8 * value / QUANTIZATION)))
+                bits.append(_block_bits(dc - predictions[component]))
+                predictions[component] = dc
+    scan = "".join(bits)
+    scan += "1" * (-len(scan) % 8)
+    data = int(scan, 2).to_bytes(len(scan) // 8, "big")
+    return data.replace(b"\xff", b"\xff\x00")
+
+
+def _padding(size: int) -> bytes:
+    """Comment segments adding exactly size bytes, which must be 0 or at
+    least 4."""
+    segments = []
+    while size:
+        length = min(size, MAX_SEGMENT + 2)
+        if 0 < size - length < 4:
+            length -= 4
+        segments.append(_segment(0xFE, bytes(length - 4)))
+        size -= length
+    return b"".join(segments)
+
+
+def render_jpeg(
+    min_length: Optional[int] = None,
+    max_length: Optional[int] = None,
+    rng: Random = cast(Random, random),
+    width: Dimension = DEFAULT_DIMENSION,
+    height: Dimension = DEFAULT_DIMENSION,
+) -> bytes:
+    """Encodes a random baseline JPEG image of flat 8x8 blocks, sized to fit
+    between min_length and max_length bytes when possible.
+
+    Its width and height are drawn from the given ranges, and only shrunk
+    when the image would not fit under max_length otherwise.
+    """
+    width, height = draw_dimensions(width, height, MAX_DIMENSION, rng)
+    columns, rows = -(-width // 8), -(-height // 8)
+    if max_length is not None:
+        # Leave room for the smallest comment segment
+        max_blocks = max((max_length - OVERHEAD - 4) // BLOCK_SIZE, 1)
+        if columns * rows > max_blocks:
+            columns = rng.randint(1, min(columns, max_blocks))
+            rows = max(min(rows, max_blocks // columns), 1)
+            width, height = columns * 8, rows * 8
+
+    while True:
+        image = [
+            b"\xff\xd8",
+            _headers(width, height),
+            SCAN_HEADER,
+            _scan(columns, rows, rng),
+            b"\xff\xd9",
+        ]
+        size = sum(map(len, image))
+        # Byte stuffing can, rarely, take a scan past its estimated size
+        if max_length is None or size + 4 <= max_length or columns * rows == 1:
+            break
+        columns, rows = max(columns // 2, 1), max(rows // 2, 1)
+        width, height = columns * 8, rows * 8
+    if min_length is not None and size < min_length:
+        image.insert(1, _padding(max(min_length - size, 4)))
+    return b"".join(image)
+
+
+pool = BlobPool(render_jpeg, options={"width": DEFAULT_DIMENSION, "height": DEFAULT_DIMENSION})
+
+
+def random_jpg(
+    min_length: Optional[int] = None,
+    max_length: Optional[int] = None,
+    rng: Random = cast(Random, random),
+) -> bytes:
+    return pool.draw(min_length, max_length, rng)
@@ -1,13 +1,106 @@
 import random
+import struct
+from random import Random
+from typing import List, Optional, Tuple, cast
 
-import requests  # pants: no-infer-dep
+from jsf.schema_types.string_utils.content_type.dimensions import (
+    DEFAULT_DIMENSION,
+    Dimension,
+    draw_dimensions,
+)
+from jsf.schema_types.string_utils.content_type.pool import BlobPool
 
-from jsf.schema_types.string_utils.content_encoding import bytes_str_repr
+MAX_DIMENSION = 1 << 14
+# Bits of the lossless bitstream before its pixels: the signature, image size, flags and the five
+# prefix codes
+HEADER_BITS = 115
+# Every pixel picks one of two values for each of its green, red and blue channels
+PIXEL_BITS = 3
+# The bytes of the RIFF header and of the header of the VP8L chunk, and its padding byte
+OVERHEAD = 12 + 8 + 1
+# The bytes of the VP8X chunk and of the header of the chunk padding the file
+PADDING_OVERHEAD = 18 + 8
 
 
-def random_webp(*args, **kwargs) -> str:
-    return bytes_str_repr(
-        requests.get(
-            f"https://picsum.photos/{random.randint(1,50)*10}/{random.randint(1,50)*10}.webp"
-        ).content
-    )
+def _chunk(fourcc: bytes, payload: bytes) -> bytes:
+    return fourcc + struct.pack("<I", len(payload)) + payload + b"\x00" * (len(payload) % 2)
+
+
+def _bitstream(width: int, height: int, rng: Random) -> bytes:
+    """A lossless (VP8L) bitstream of random pixels, each channel drawing from
+    two random values, so that every pixel takes three bits."""
+    fields: List[Tuple[int, int]] = [
+        (0x2F, 8),  # Signature
+        (width - 1, 14),
+        (height - 1, 14),
+        (0, 1),  # No alpha
+        (0, 3),  # Version
+        (0, 1),  # No transform
+        (0, 1),  # No color cache
+        (0, 1),  # No meta prefix codes
+    ]
+    for _ in range(3):  # Green, red and blue, as simple prefix codes of two 8 bit symbols
+        first = rng.randrange(256)
+        second = (first + rng.randrange(1, 256)) % 256
+        fields += [(1, 1), (1, 1), (1, 1), (first, 8), (second, 8)]
+    fields += [(1, 1), (0, 1), (1, 1), (255, 8)]  # Opaque alpha, as a single symbol
+    fields += [(1, 1), (0, 1), (0, 1), (0, 1)]  # Unused distance code, as a single symbol
+
+    bits, position = 0, 0
+    for value, size in fields:
+        bits |= value << position
+        position += size
+    pixels = PIXEL_BITS * width * height
+    bits |= rng.getrandbits(pixels) << position
+    return bits.to_bytes(-(-(position + pixels) // 8), "little")
+
+
+def _dimensions(
+    rng: Random, max_pixels: Optional[int], width_range: Dimension, height_range: Dimension
+) -> Tuple[int, int]:
+    width, height = draw_dimensions(width_range, height_range, MAX_DIMENSION, rng)
+    if max_pixels is not None and width * height > max_pixels:
+        width = rng.randint(1, min(width, max_pixels))
+        height = max(min(height, max_pixels // width), 1)
+    return width, height
+
+
+def render_webp(
+    min_length: Optional[int] = None,
+    max_length: Optional[int] = None,
+    rng: Random = cast(Random, random),
+    width: Dimension = DEFAULT_DIMENSION,
+    height: Dimension = DEFAULT_DIMENSION,
+) -> bytes:
+    """Encodes a random lossless WebP image, sized to fit between min_length
+    and max_length bytes when possible.
+
+    Its width and height are drawn from the given ranges, and only shrunk
+    when the image would not fit under max_length otherwise.
+    """
+    max_pixels = None
+    if max_length is not None:
+        max_bits = (max_length - OVERHEAD - PADDING_OVERHEAD) * 8 - HEADER_BITS
+        max_pixels = min(max(max_bits // PIXEL_BITS, 1), MAX_DIMENSION**2)
+    width, height = _dimensions(rng, max_pixels, width, height)
+
+    chunks = [_chunk(b"VP8L", _bitstream(width, height, rng))]
+    size = 12 + len(chunks[0])
+    if min_length is not None and size < min_length:
+        # Unknown chunks are only allowed in the extended format, which starts with a VP8X chunk
+        canvas = (width - 1).to_bytes(3, "little") + (height - 1).to_bytes(3, "little")
+        chunks.insert(0, _chunk(b"VP8X", bytes(4) + canvas))
+        chunks.append(_chunk(b"JSFP", bytes(max(min_length - size - PADDING_OVERHEAD, 0))))
+    riff = b"WEBP" + b"".join(chunks)
+    return b"RIFF" + struct.pack("<I", len(riff)) + riff
+
+
+pool = BlobPool(render_webp, options={"width": DEFAULT_DIMENSION, "height": DEFAULT_DIMENSION})
+
+
+def random_webp(
+    min_length: Optional[int] = None,
+    max_length: Optional[int] = None,
+    rng: Random = cast(Random, random),
+) -> bytes:
+    return pool.draw(min_length, max_length, rng)
@@ -0,0 +1,81 @@
+import threading
+from collections import OrderedDict
+from random import Random
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Renders a payload from its length bounds, a random number generator and the pool's render options
+Render = Callable[..., bytes]
+Bounds = Tuple[Optional[int], Optional[int]]
+
+
+class BlobPool:
+    """Payloads of one content type rendered once and then drawn at random,
+    so that generating them costs no more than picking one.
+
+    A pool of payloads is kept for each pair of length bounds, the size of
+    the payloads in bytes, that schemas ask for. It is rendered on first
+    use, from a seed derived from the bounds, so that seeded generation
+    draws the same payloads in every process. Pools are shared by every
+    thread, and only change when they are filled or dropped, under a lock.
+
+    Args:
+        render (Render): Renders a payload between a minimum and a maximum length, if any, from the given random number generator, and the render options as keyword arguments.
+        size (int, optional): The number of payloads pooled for each pair of bounds, 0 disables pooling. Defaults to 16.
+        fresh_every (int, optional): Each draw has a one in fresh_every chance of returning a payload rendered afresh from the random number generator of the generation, rather than a pooled one, so that output keeps varying. Fresh payloads aren't pooled and pooled payloads are never replaced, so seeded output only depends on the seed. None only draws pooled payloads. Defaults to 100.
+        max_bounds (int, optional): The number of pairs of bounds to keep payloads for, the least recently used are dropped first. Defaults to 32.
+        seed (int, optional): The seed the pools are rendered from. Defaults to 0.
+        options (Dict[str, Any], optional): The render options and their defaults, which `configure` can change like the other settings, eg. the dimensions of images. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        render: Render,
+        size: int = 16,
+        fresh_every: Optional[int] = 100,
+        max_bounds: int = 32,
+        seed: int = 0,
+        options: Optional[Dict[str, Any]] = None,
+    ):
+        self.render = render
+        self.size = size
+        self.fresh_every = fresh_every
+        self.max_bounds = max_bounds
+        self.seed = seed
+        self.options = dict(options or {})
+        # The payloads of each pair of bounds
+        self._pools: "OrderedDict[Bounds, List[bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, **kwargs: Any) -> None:
+        """Changes the settings given as keyword arguments, and drops the
+        payloads pooled so far."""
+        for name, value in kwargs.items():
+            if name in self.options:
+                self.options[name] = value
+            elif name in ("size", "fresh_every", "max_bounds", "seed"):
+                setattr(self, name, value)
+            else:
+                raise ValueError(f"Unknown blob pool setting {name}")
+        with self._lock:
+            self._pools.clear()
+
+    def _fill(self, bounds: Bounds) -> List[bytes]:
+        rng = Random(f"{self.seed}/{bounds}")
+        return [self.render(*bounds, rng, **self.options) for _ in range(self.size)]
+
+    def draw(self, min_length: Optional[int], max_length: Optional[int], rng: Random) -> bytes:
+        if not self.size:
+            return self.render(min_length, max_length, rng, **self.options)
+        bounds = (min_length, max_length)
+        with self._lock:
+            blobs = self._pools.get(bounds)
+            if blobs is None:
+                blobs = self._pools[bounds] = self._fill(bounds)
+                while len(self._pools) > self.max_bounds:
+                    self._pools.popitem(last=False)
+            else:
+                self._pools.move_to_end(bounds)
+
+        if self.fresh_every is not None and rng.randrange(self.fresh_every) == 0:
+            return self.render(min_length, max_length, rng, **self.options)
+        return blobs[rng.randrange(len(blobs))]
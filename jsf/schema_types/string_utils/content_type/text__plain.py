@@ -1,4 +1,6 @@
 import random
+from random import Random
+from typing import List, Tuple, cast
 
 LOREM = """Lorem ipsum dolor sit amet consectetur adipisicing elit.
 Hic molestias, esse veniam placeat officiis nobis architecto modi
@@ -7,19 +9,38 @@ reprehenderit ipsum, repellendus culpa! Nullam vehicula ipsum a arcu cursus vita
 Enim nec dui nunc mattis enim ut tellus.""".split()
 
 
-def random_fixed_length_sentence(_min: int = 0, _max: int = 50) -> str:
+LONGEST = max(len(word) for word in LOREM)
+# The words that fit in each remaining length, up to the longest word where they all fit
+WORDS_UP_TO_LENGTH: Tuple[Tuple[str, ...], ...] = tuple(
+    tuple(word for word in LOREM if len(word) <= n) for n in range(LONGEST + 1)
+)
+
+
+def random_fixed_length_sentence(
+    _min: int = 0, _max: int = 50, rng: Random = cast(Random, random)
+) -> str:
     if _min > _max:
         raise ValueError("'_max' should be greater than '_min'")  # pragma: no cover
-    output = ""
+    words: List[str] = []
+    length = 0  # Length of the sentence so far, counting a space after each word
     while True:
-        remaining = _max - len(output)
-        valid_words = list(filter(lambda s: len(s) <= remaining, LOREM))
+        # Runs of words that can't reach either bound are drawn in one go
+        run = (min(_min, _max - LONGEST) - length) // (LONGEST + 1)
+        if run > 0:
+            drawn = rng.choices(LOREM, k=run)
+            words.extend(drawn)
+            length += sum(map(len, drawn)) + run
+            continue
+        remaining = _max - length
+        valid_words = WORDS_UP_TO_LENGTH[min(remaining, LONGEST)] if remaining > 0 else ()
         if len(valid_words) == 0:
             break
-        if len(output) >= _min and random.uniform(0, 1) > 0.9:
+        if length >= _min and rng.uniform(0, 1) > 0.9:
             break
-        output += random.choice(valid_words) + " "
-    output = output.strip()
+        word = rng.choice(valid_words)
+        words.append(word)
+        length += len(word) + 1
+    output = " ".join(words)
     if len(output) < _min:
         output = output + "."
     return output
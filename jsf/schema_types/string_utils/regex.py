@@ -0,0 +1,146 @@
+import random
+import string
+from functools import lru_cache
+from random import Random
+from typing import Any, Callable, Dict, List, Sequence, cast
+
+try:
+    import re._constants as sre_constants  # type: ignore
+    import re._parser as sre_parse  # type: ignore
+except ImportError:  # Python < 3.11
+    import sre_constants  # type: ignore
+    import sre_parse  # type: ignore
+
+# Upper bound on the repeats generated for *, + and open {n,} quantifiers
+STAR_PLUS_LIMIT = 100
+
+# Alphabets are sorted so that seeded generation doesn't depend on set ordering
+PRINTABLE = string.printable
+CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: string.digits,
+    sre_constants.CATEGORY_NOT_DIGIT: string.ascii_letters + string.punctuation,
+    sre_constants.CATEGORY_SPACE: string.whitespace,
+    sre_constants.CATEGORY_NOT_SPACE: string.printable.strip(),
+    sre_constants.CATEGORY_WORD: string.ascii_letters + string.digits + "_",
+    sre_constants.CATEGORY_NOT_WORD: "".join(
+        sorted(set(string.printable) - set(string.ascii_letters + string.digits + "_"))
+    ),
+}
+
+# A compiled node generates its part of the string from the random number generator, and the
+# text matched so far by each capture group (for backreferences)
+Node = Callable[[Random, Dict[int, str]], str]
+Xeger = Callable[[Random], str]
+
+
+def _constant(value: str) -> Node:
+    return lambda rng, groups: value
+
+
+def _choice(candidates: Sequence[str]) -> Node:
+    return lambda rng, groups: rng.choice(candidates)
+
+
+def _compile_in(items: List[Any]) -> Node:
+    candidates: List[str] = []
+    negate = False
+    for op, av in items:
+        if op is sre_constants.NEGATE:
+            negate = True
+        elif op is sre_constants.LITERAL:
+            candidates.append(chr(av))
+        elif op is sre_constants.RANGE:
+            candidates.extend(chr(i) for i in range(av[0], av[1] + 1))
+        elif op is sre_constants.CATEGORY:
+            candidates.extend(CATEGORIES[av])
+        else:
+            raise ValueError(f"Unsupported regular expression set item {op}")
+    if negate:
+        candidates = sorted(set(PRINTABLE) - set(candidates))
+    return _choice("".join(candidates))
+
+
+def _compile_repeat(_min: int, _max: int, node: Node) -> Node:
+    _max = min(_max, STAR_PLUS_LIMIT)
+
+    def repeat(rng: Random, groups: Dict[int, str]) -> str:
+        return "".join(node(rng, groups) for _ in range(rng.randint(_min, _max)))
+
+    return repeat
+
+
+def _compile_group(group: int, node: Node) -> Node:
+    def capture(rng: Random, groups: Dict[int, str]) -> str:
+        groups[group] = value = node(rng, groups)
+        return value
+
+    return capture
+
+
+def _compile_state(op: Any, av: Any) -> Node:
+    if op is sre_constants.LITERAL:
+        return _constant(chr(av))
+    if op is sre_constants.NOT_LITERAL:
+        return _choice(PRINTABLE.replace(chr(av), ""))
+    if op is sre_constants.ANY:
+        return _choice(PRINTABLE.replace("\n", ""))
+    if op is sre_constants.IN:
+        return _compile_in(av)
+    if op in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+        # Lookarounds don't consume any characters of their own
+        return _constant("")
+    if op is sre_constants.BRANCH:
+        branches = [_compile_sequence(branch) for branch in av[1]]
+        return lambda rng, groups: rng.choice(branches)(rng, groups)
+    if op is sre_constants.SUBPATTERN:
+        group, node = av[0], _compile_sequence(av[-1])
+        return node if group is None else _compile_group(group, node)
+    if op is sre_constants.GROUPREF:
+        return lambda rng, groups: groups.get(av, "")
+    if op in (sre_constants.MIN_REPEAT, sre_constants.MAX_REPEAT) or op is getattr(
+        sre_constants, "POSSESSIVE_REPEAT", None
+    ):
+        return _compile_repeat(av[0], av[1], _compile_sequence(av[2]))
+    if op is getattr(sre_constants, "ATOMIC_GROUP", None):
+        return _compile_sequence(av)
+    raise ValueError(f"Unsupported regular expression construct {op}")
+
+
+def _compile_sequence(parsed: Any) -> Node:
+    nodes: List[Node] = []
+    literal = ""
+    # Runs of literal characters are joined into a single constant
+    for op, av in parsed:
+        if op is sre_constants.LITERAL:
+            literal += chr(av)
+            continue
+        if literal:
+            nodes.append(_constant(literal))
+            literal = ""
+        nodes.append(_compile_state(op, av))
+    if literal:
+        nodes.append(_constant(literal))
+
+    if not nodes:
+        return _constant("")
+    if len(nodes) == 1:
+        return nodes[0]
+    return lambda rng, groups: "".join(node(rng, groups) for node in nodes)
+
+
+@lru_cache(maxsize=1024)
+def compile_regex(pattern: str) -> Xeger:
+    """Parses the regular expression once into a generator of strings
+    matching it, which draws from the random number generator it is given.
+
+    Compiled generators are cached by pattern, so schema nodes sharing a
+    pattern share its generator.
+    """
+    node = _compile_sequence(sre_parse.parse(pattern))
+    return lambda rng: node(rng, {})
+
+
+def xeger(pattern: str, rng: Random = cast(Random, random)) -> str:
+    """Generates a string matching the regular expression, drawing from the
+    given random number generator."""
+    return compile_regex(pattern)(rng)
@@ -0,0 +1,92 @@
+from collections.abc import ItemsView, KeysView, ValuesView
+from copy import deepcopy
+from typing import Any, Dict, Iterator, Mapping, Set
+
+# Values of these types are shared with the base state rather than copied. Tuples and frozensets
+# are assumed to only hold immutable values.
+IMMUTABLE = (type(None), bool, int, float, complex, str, bytes, tuple, frozenset, range)
+
+
+class State(Dict[str, Any]):
+    """Generation state layered over a shared base state.
+
+    Creating a state is O(1) whatever the size of the base state. Keys are
+    read through to the base state the first time they are accessed, with
+    mutable values deep copied on the way, so that changes made during one
+    generation never leak into the base state or into other generations.
+    Once read or written, keys are plain dictionary entries.
+    """
+
+    __slots__ = ("_base", "_deleted")
+
+    def __init__(self, base: Mapping[str, Any]):
+        super().__init__()
+        self._base = base
+        self._deleted: Set[str] = set()
+
+    def __missing__(self, key: str) -> Any:
+        if key in self._deleted or key not in self._base:
+            raise KeyError(key)
+        value = self._base[key]
+        if not isinstance(value, IMMUTABLE):
+            value = deepcopy(value)
+        self[key] = value
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return dict.__contains__(self, key) or (key not in self._deleted and key in self._base)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from dict.__iter__(self)
+        for key in self._base:
+            if not dict.__contains__(self, key) and key not in self._deleted:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        dict.pop(self, key, None)
+        if key in self._base:
+            self._deleted.add(key)
+
+    def __eq__(self, other: object) -> bool:
+        return dict(self.items()) == other
+
+    def __repr__(self) -> str:
+        return f"State({dict(self.items())!r})"
+
+    def __reduce__(self) -> Any:
+        # Copies and pickles are flattened into plain dictionaries
+        return dict, (dict(self.items()),)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if key not in self:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        value = self[key]
+        del self[key]
+        return value
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def keys(self) -> KeysView:
+        return KeysView(self)
+
+    def values(self) -> ValuesView:
+        return ValuesView(self)
+
+    def items(self) -> ItemsView:
+        return ItemsView(self)
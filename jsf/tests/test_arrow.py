@@ -0,0 +1,55 @@
+import json
+
+import pytest  # pants: no-infer-dep
+from jsf.parser import JSF
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+from jsf.arrow import arrow_schema  # noqa: E402
+
+
+def test_arrow_schema(TestData):
+    with open(TestData / "array-dicts.json") as file:
+        schema = json.load(file)
+    p = JSF(schema)
+
+    arrow, _ = arrow_schema(p.root)
+    basket = arrow.field("Basket").type
+    assert pa.types.is_list(basket)
+    assert basket.value_type == pa.struct(
+        [pa.field("Item Name", pa.string()), pa.field("Amount", pa.int64())]
+    )
+
+
+def test_arrow_schema_json_fallback(TestData):
+    with open(TestData / "object_recursive.json") as file:
+        schema = json.load(file)
+    p = JSF(schema)
+
+    arrow, convert = arrow_schema(p.root)
+    assert convert is not None
+    batch = next(p.iter_record_batches(20, batch_size=5))
+    assert batch.schema == arrow
+    assert batch.num_rows == 5
+
+
+@pytest.mark.parametrize("filestem", ["custom", "tuple-object", "string-format"])
+def test_to_parquet(TestData, tmp_path, filestem):
+    with open(TestData / f"{filestem}.json") as file:
+        schema = json.load(file)
+    p = JSF(schema)
+    output = tmp_path / "output.parquet"
+
+    p.to_parquet(output, 25, batch_size=10)
+    parquet = pq.ParquetFile(output)
+    assert parquet.metadata.num_rows == 25
+    assert parquet.schema_arrow == arrow_schema(p.root)[0]
+    assert all(isinstance(record, dict) for record in parquet.read().to_pylist())
+
+
+def test_arrow_schema_requires_fixed_properties(TestData):
+    with open(TestData / "object-pattern-properties.json") as file:
+        schema = json.load(file)
+
+    with pytest.raises(ValueError):
+        arrow_schema(JSF(schema).root)
@@ -23,3 +23,21 @@ def test_app(TestData):
         validate(instance, schema)
     finally:
         file.unlink()
+
+
+def test_app_bulk(TestData, tmp_path):
+    schema = TestData / "object.json"
+    args = ["--schema", schema, "--count", "25", "--seed", "7", "--batch-size", "10"]
+
+    result = runner.invoke(app, [*args, "--instance", "-", "--format", "jsonl"])
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert len(records) == 25
+    assert "25/25 records" in result.stderr
+
+    file = tmp_path / "out.json"
+    result = runner.invoke(app, [*args, "--instance", file, "--workers", "2", "--no-progress"])
+    assert result.exit_code == 0
+    with open(file) as f:
+        assert json.load(f) == records
+    assert result.stderr == ""
@@ -0,0 +1,88 @@
+import json
+
+import pytest  # pants: no-infer-dep
+from jsf.parser import JSF
+from jsonschema import validate
+
+np = pytest.importorskip("numpy")
+from jsf.columnar import columns_to_records  # noqa: E402
+
+
+def test_generate_columns(TestData):
+    with open(TestData / "object.json") as file:
+        schema = json.load(file)
+    p = JSF(schema)
+
+    columns = p.generate_columns(1000)
+    assert set(columns) == {"name", "credit_card", "test", "non_required"}
+    assert all(len(column) == 1000 for column in columns.values())
+    assert columns["credit_card"].dtype == np.float64
+    assert columns["test"].dtype == np.int64
+    assert columns["name"].dtype == object
+    assert not np.ma.is_masked(columns["test"])
+    assert 0 < np.ma.count_masked(columns["non_required"]) < 1000
+
+
+def test_generate_columns_respects_constraints(TestData):
+    with open(TestData / "integer.json") as file:
+        integer = json.load(file)
+    p = JSF(
+        {
+            "type": "object",
+            "properties": {
+                "int": integer,
+                "flag": {"type": "boolean"},
+                "colour": {"enum": ["red", "amber", "green"]},
+                "maybe": {"type": ["integer", "null"], "minimum": 1, "maximum": 3},
+            },
+            "required": ["int", "flag", "colour", "maybe"],
+        }
+    )
+
+    columns = p.generate_columns(1000)
+    assert np.all((columns["int"] > 600) & (columns["int"] <= 700))
+    assert np.all(columns["int"] % 7 == 0)
+    assert set(columns["flag"].tolist()) == {True, False}
+    assert set(columns["colour"].tolist()) == {"red", "amber", "green"}
+    assert set(columns["maybe"].tolist()) == {1, 2, 3, None}
+
+
+def test_columns_to_records(TestData):
+    with open(TestData / "object.json") as file:
+        schema = json.load(file)
+    p = JSF(schema, seed=1)
+
+    columns = p.generate_columns(10)
+    assert p.generate_columns(10)["test"].tolist() == columns["test"].tolist()
+    records = columns_to_records(columns)
+    assert len(records) == 10
+    for record in records:
+        assert isinstance(record["name"], str)
+        assert isinstance(record["test"], int)
+        assert isinstance(record.get("non_required", 0), int)
+
+
+def test_columns_to_records_leave_out_dropped_properties():
+    schema = {
+        "type": "object",
+        "properties": {
+            "a": {"type": "integer"},
+            "b": {"type": "boolean"},
+            "c": {"type": ["integer", "null"]},
+            "d": {"type": "string"},
+        },
+        "required": ["a"],
+    }
+    records = columns_to_records(JSF(schema).generate_columns(200))
+    for record in records:
+        validate(instance=record, schema=schema)
+    assert 0 < sum("b" in record for record in records) < 200
+    assert any(record.get("c", 0) is None for record in records)
+
+
+def test_generate_columns_requires_object(TestData):
+    with open(TestData / "integer.json") as file:
+        schema = json.load(file)
+
+    with pytest.raises(ValueError):
+        JSF(schema).generate_columns(10)
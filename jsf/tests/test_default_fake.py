@@ -1,9 +1,17 @@
+import asyncio
 import json
+import pickle
+import random
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 import jwt  # pants: no-infer-dep
+import pytest  # pants: no-infer-dep
 from jsf.parser import JSF
+from jsf.unique import EXACT_KEY_BYTES, UniqueIndex
+from jsonschema import validate
 
 
 def test_fake_object_no_properties(TestData):
@@ -135,7 +143,7 @@ def test_fake_string_content_type(TestData):
         schema = json.load(file)
     p = JSF(schema)
     assert isinstance(p.generate(), dict)
-    fake_data = [p.generate() for _ in range(10)]  # Reducing for rate limiting of external requests
+    fake_data = [p.generate() for _ in range(10)]
     for d in fake_data:
         assert len(d["text/plain"]) >= 5 and len(d["text/plain"]) <= 10
 
@@ -145,6 +153,41 @@ def test_fake_string_content_type(TestData):
         assert isinstance(decoded_jwt["iss"], str)
 
 
+@pytest.mark.parametrize(
+    "media_type",
+    ["image/jpeg", "image/webp", "application/zip", "application/gzip", "text/plain"],
+)
+@pytest.mark.parametrize(
+    "encoding", [None, "base-64", "base-32", "base-16", "quoted-printable", "7-bit", "8-bit"]
+)
+def test_fake_string_content_length(media_type, encoding):
+    schema = {"type": "string", "contentMediaType": media_type, "minLength": 200, "maxLength": 800}
+    if encoding is not None:
+        schema["contentEncoding"] = encoding
+    for fake_data in JSF(schema).generate(20):
+        validate(instance=fake_data, schema=schema)
+
+
+def test_fake_string_content_too_long():
+    schema = {"type": "string", "contentMediaType": "image/jpeg", "maxLength": 100}
+    with pytest.raises(ValueError, match="image/jpeg content of at most 100 characters as escaped"):
+        JSF(schema).generate()
+
+
+@pytest.mark.parametrize(
+    "schema",
+    [
+        {"format": "email", "contentEncoding": "base-64", "maxLength": 20},
+        {"contentMediaType": "application/jwt", "maxLength": 50},
+        {"contentEncoding": "base-64", "minLength": 1, "maxLength": 3},
+    ],
+)
+def test_fake_string_content_infeasible_text(schema):
+    # Text that can't fit its bounds once encoded is generated anyway, as it always was
+    fake_data = JSF({"type": "string", **schema}).generate(10)
+    assert all(isinstance(d, str) and d for d in fake_data)
+
+
 def test_fake_null(TestData):
     with open(TestData / "null.json") as file:
         schema = json.load(file)
@@ -403,6 +446,68 @@ def test_unique_items_array(TestData):
         assert len(set(f)) == len(f), f
 
 
+def test_unique_items_nested_objects():
+    schema = {
+        "type": "array",
+        "uniqueItems": True,
+        "minItems": 500,
+        "maxItems": 500,
+        "items": {
+            "type": "object",
+            "required": ["id", "tags"],
+            "properties": {
+                "id": {"type": "integer", "minimum": 0, "maximum": 100_000},
+                "tags": {"type": "array", "items": {"type": "boolean"}, "minItems": 1},
+            },
+        },
+    }
+    fake_data = JSF(schema).generate()
+    assert len(fake_data) == 500
+    assert len({json.dumps(f, sort_keys=True) for f in fake_data}) == 500
+
+
+@pytest.mark.parametrize(
+    "items",
+    [
+        {"type": "boolean"},
+        {"type": "integer", "minimum": 1, "maximum": 4},
+        {"enum": ["a", "b", "c", "a"]},
+        {"type": ["boolean", "null"]},
+    ],
+)
+def test_unique_items_infeasible(items):
+    schema = {"type": "array", "uniqueItems": True, "minItems": 5, "items": items}
+    with pytest.raises(ValueError, match="requires 5 unique items"):
+        JSF(schema)
+
+
+def test_unique():
+    schema = {
+        "type": "object",
+        "properties": {
+            "id": {"type": "integer", "minimum": 0, "maximum": 99, "$unique": True},
+            "email": {"type": "string", "$provider": "faker.email", "$unique": True},
+        },
+        "required": ["id", "email"],
+    }
+    p = JSF(schema)
+    for fake_data in (p.generate(100), list(p.iter_generate(100))):
+        assert sorted(f["id"] for f in fake_data) == list(range(100))
+        assert len({f["email"] for f in fake_data}) == 100
+
+    with pytest.raises(ValueError, match="another unique value at #/id"):
+        list(p.iter_generate(101))
+
+
+def test_unique_index():
+    index = UniqueIndex(max_memory=100 * EXACT_KEY_BYTES)
+    assert all(index.add(i) for i in range(1000))
+    assert index._filters
+    assert not any(index.add(i) for i in range(1000))
+    assert index.add({"a": [1, 2]}) and not index.add({"a": [1, 2]})
+    assert index.count == 1001
+
+
 def test_const(TestData):
     with open(TestData / "const.json") as file:
         schema = json.load(file)
@@ -544,3 +649,200 @@ def test_use_defaults_and_examples(TestData):
         assert d["name"] in ["Chop", "Luna", "Thanos"]
         breed = d.get("breed")
         assert breed is None or breed == "Mixed Breed"
+
+
+def test_iter_generate(TestData):
+    with open(TestData / "object.json") as file:
+        schema = json.load(file)
+    p = JSF(schema)
+
+    assert len(list(p.iter_generate(5))) == 5
+    infinite = p.iter_generate()
+    fake_data = [next(infinite) for _ in range(100)]
+    assert all(isinstance(d, dict) and isinstance(d["name"], str) for d in fake_data), fake_data
+
+
+def test_to_jsonl(TestData, tmp_path):
+    with open(TestData / "custom.json") as file:
+        schema = json.load(file)
+    p = JSF(schema)
+    output = tmp_path / "output.jsonl"
+
+    p.to_jsonl(output, 20)
+    with open(output) as file:
+        lines = file.read().splitlines()
+    assert len(lines) == 20
+    for line in lines:
+        validate(json.loads(line), schema)
+
+
+def test_pickle(TestData):
+    with open(TestData / "object_recursive.json") as file:
+        schema = json.load(file)
+    p = JSF(schema)
+    p.generate()
+
+    clone = pickle.loads(pickle.dumps(p))
+    assert clone.base_context["random"] is random
+    assert isinstance(clone.generate(), dict)
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_generate_parallel(ordered):
+    p = JSF(
+        {
+            "type": "object",
+            "properties": {
+                "id": {"type": "integer", "$provider": "lambda: next(state['__counter__'])"},
+                "name": {"type": "string", "$provider": "faker.name"},
+            },
+            "required": ["id", "name"],
+        }
+    )
+
+    fake_data = p.generate_parallel(95, workers=2, chunk_size=10, ordered=ordered)
+    assert len(fake_data) == 95
+    ids = [d["id"] for d in fake_data]
+    assert len(set(ids)) == len(ids)
+    if ordered:
+        assert [d["id"] for d in fake_data[::10]] == list(range(1, 11))
+
+
+@pytest.mark.parametrize("thread_safe", [False, True])
+def test_generate_parallel_reseeds_workers(thread_safe):
+    p = JSF(
+        {
+            "type": "object",
+            "properties": {
+                "number": {"type": "integer", "minimum": 0, "maximum": 1000000000},
+                "name": {"type": "string", "$provider": "faker.name"},
+            },
+            "required": ["number", "name"],
+        },
+        thread_safe=thread_safe,
+    )
+    p.generate()
+
+    fake_data = p.generate_parallel(400, workers=4, chunk_size=100)
+    assert len({d["number"] for d in fake_data}) == 400
+    assert len({d["name"] for d in fake_data}) > 300
+
+
+def test_seeded_generation_is_deterministic(TestData):
+    with open(TestData / "seeded.json") as file:
+        schema = json.load(file)
+
+    fake_data = JSF(schema, seed=42).generate(20)
+    assert JSF(schema, seed=42).generate(20) == fake_data
+    assert JSF(schema, seed=7).generate(20) != fake_data
+    assert len({json.dumps(d, sort_keys=True) for d in fake_data}) == 20
+
+
+def test_generate_at(TestData):
+    with open(TestData / "seeded.json") as file:
+        schema = json.load(file)
+    p = JSF(schema, seed=42)
+
+    fake_data = list(p.iter_generate(20))
+    for index in [0, 7, 19]:
+        assert p.generate_at(index) == fake_data[index]
+    assert JSF(schema, seed=42).generate_at(1000) == p.generate_at(1000)
+
+
+def test_generate_for_key(TestData):
+    with open(TestData / "seeded.json") as file:
+        schema = json.load(file)
+
+    user = JSF(schema, seed=42).generate_for_key("user-42")
+    assert JSF(schema, seed=42).generate_for_key("user-42") == user
+    assert JSF(schema, seed=42).generate_for_key("user-43") != user
+    assert JSF(schema, seed=42).generate_for_key(42) != user
+
+
+def test_seeded_dates_ignore_the_clock():
+    schema = {
+        "type": "object",
+        "properties": {
+            "created": {"type": "string", "format": "date-time"},
+            "time": {"type": "string", "format": "time"},
+            "token": {"type": "string", "contentMediaType": "application/jwt"},
+        },
+        "required": ["created", "time", "token"],
+    }
+
+    fake_data = JSF(schema, seed=42).generate_at(0)
+    time.sleep(1.1)
+    assert JSF(schema, seed=42).generate_at(0) == fake_data
+
+
+def test_unseeded_dates_follow_the_clock():
+    schema = {"type": "string", "format": "date-time"}
+    assert max(JSF(schema).generate(1000)) >= "2025-01-01"
+    assert max(JSF(schema, seed=42).generate(1000)) < "2025-01-01"
+
+
+def test_generate_at_requires_seed(TestData):
+    with open(TestData / "seeded.json") as file:
+        schema = json.load(file)
+
+    with pytest.raises(ValueError):
+        JSF(schema).generate_at(0)
+
+
+def test_seeded_generate_parallel(TestData):
+    with open(TestData / "seeded.json") as file:
+        schema = json.load(file)
+    p = JSF(schema, seed=42)
+
+    assert p.generate_parallel(45, workers=2, chunk_size=10) == p.generate(45)
+
+
+def test_thread_safe(TestData):
+    with open(TestData / "seeded.json") as file:
+        schema = json.load(file)
+    p = JSF(schema, seed=42, thread_safe=True)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        records = list(executor.map(p.generate_at, range(100)))
+    assert records == p.generate(100)
+
+    p = JSF(schema, thread_safe=True)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for record in executor.map(lambda _: p.generate(), range(100)):
+            validate(record, schema)
+
+
+def test_agenerate(TestData):
+    with open(TestData / "seeded.json") as file:
+        schema = json.load(file)
+    p = JSF(schema, seed=42)
+
+    async def collect():
+        return [record async for record in p.aiter_generate(25, batch_size=10)]
+
+    assert asyncio.run(collect()) == p.generate(25)
+    assert asyncio.run(p.agenerate()) == p.generate()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert asyncio.run(p.agenerate(25, executor=executor)) == p.generate(25)
+
+
+def test_async_provider():
+    async def lookup():
+        await asyncio.sleep(0)
+        return 42
+
+    schema = {
+        "type": "object",
+        "required": ["id", "tags"],
+        "properties": {
+            "id": {"type": "string", "$provider": "lookup"},
+            "tags": {"type": "array", "items": {"type": "integer", "$provider": "lookup"}},
+        },
+    }
+    p = JSF(schema, context={"lookup": lookup})
+
+    for record in asyncio.run(p.agenerate(10)):
+        assert record["id"] == "42"
+        assert all(tag == 42 for tag in record["tags"])
+    with pytest.raises(ValueError, match="#/id"):
+        p.generate()
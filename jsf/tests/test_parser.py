@@ -1,7 +1,10 @@
 import json
+import os
+import subprocess
+import sys
 
 import pytest  # pants: no-infer-dep
-from jsf.parser import JSF
+from jsf.parser import JSF, _load_external
 
 from jsf.schema_types import (
     Array,
@@ -124,3 +127,187 @@ def test_unordered_refs_object(TestData):
         "bar": JSFEnum,
     }
     assert {prop.name: type(prop) for prop in p.root.properties[0].properties} == expected_types
+
+
+@pytest.mark.parametrize(
+    "filestem",
+    ["custom", "object_recursive", "oneof_recursive", "complex_recursive", "array-fixed-str"],
+)
+def test_compile(TestData, filestem):
+    with open(TestData / f"{filestem}.json") as file:
+        schema = json.load(file)
+    p = JSF(schema, max_recursive_depth=2)
+
+    generate = p.compile()
+    assert callable(generate)
+    assert p.compile() is not generate  # Recompiling always builds a fresh function
+    [generate(p.context) for _ in range(10)]  # Just validating no errors
+
+
+def test_compile_does_not_mutate_schema(TestData):
+    with open(TestData / "array-fixed-str.json") as file:
+        schema = json.load(file)
+    p = JSF(schema)
+    min_items, max_items = p.root.minItems, p.root.maxItems
+
+    p.generate(5)
+    assert (p.root.minItems, p.root.maxItems) == (min_items, max_items)
+
+
+@pytest.mark.parametrize(
+    "definition, keyword",
+    [
+        ({"type": "string", "$provider": "faker.name("}, "$provider"),
+        ({"type": "string", "$state": {"x": "lambda: :"}}, "$state/x"),
+        ({"type": "array", "items": {"type": "string"}, "$fixed": "lambda:"}, "$fixed"),
+    ],
+)
+def test_invalid_expression_reports_path(definition, keyword):
+    schema = {"type": "object", "properties": {"field": definition}}
+
+    with pytest.raises(ValueError, match=f"Invalid \\{keyword} expression at #/field"):
+        JSF(schema)
+
+
+def test_refs_share_definition():
+    address = {"type": "object", "properties": {"street": {"type": "string"}}}
+    schema = {
+        "type": "object",
+        "definitions": {"Address": address},
+        "properties": {
+            "home": {"$ref": "#/definitions/Address"},
+            "work": {"$ref": "#/definitions/Address"},
+        },
+    }
+    p = JSF(schema)
+
+    home, work = p.root.properties
+    assert (home.name, home.path) == ("home", "#/home")
+    assert (work.name, work.path) == ("work", "#/work")
+    assert home.properties is work.properties is p.definitions["#/definitions/Address"].properties
+
+
+def test_profile(TestData):
+    schema = {
+        "type": "object",
+        "required": ["name", "score"],
+        "properties": {"name": {"type": "string"}, "score": {"type": ["number", "null"]}},
+    }
+    profile = JSF(schema, seed=1).profile(50)
+
+    root, name, score = (profile.stats[path] for path in ("#", "#/name", "#/score"))
+    assert profile.records == root.calls == name.calls == score.calls == 50
+    assert (root.nulls, name.nulls) == (0, 0)
+    assert 0 < score.nulls < 50
+    assert root.cumulative_time >= name.cumulative_time + score.cumulative_time
+    assert root.self_time <= root.cumulative_time <= profile.total_time
+    rows = json.loads(profile.to_json(sort_by="calls"))["paths"]
+    assert {row["path"] for row in rows} == {"#", "#/name", "#/score"}
+    assert profile.table(limit=1).splitlines()[1].startswith("# ")
+
+    with open(TestData / "complex_recursive.json") as file:
+        profile = JSF(json.load(file)).profile(20)
+    assert all(s.cumulative_time <= profile.total_time for s in profile.stats.values())
+
+
+def test_external_ref_map(tmp_path):
+    common = {"definitions": {"Money": {"type": "number", "minimum": 0, "maximum": 10}}}
+    (tmp_path / "common.json").write_text(json.dumps(common))
+    money = {"$ref": "https://example.com/schemas/common.json#/definitions/Money"}
+    schema = {"type": "object", "properties": {"price": money, "tax": money}}
+
+    _load_external.cache_clear()
+    p = JSF(schema, ref_map={"https://example.com/schemas/": str(tmp_path)})
+
+    assert [type(prop) for prop in p.root.properties] == [Number, Number]
+    assert [prop.path for prop in p.root.properties] == ["#/price", "#/tax"]
+    assert _load_external.cache_info().misses == 1
+
+
+def test_from_json_cache(TestData, tmp_path):
+    cache_dir = tmp_path / "cache"
+    p = JSF.from_json(TestData / "custom.json", cache_dir=cache_dir)
+    assert len(list(cache_dir.glob("*.pickle"))) == 1
+
+    cached = JSF.from_json(TestData / "custom.json", cache_dir=cache_dir)
+    assert repr(cached.root) == repr(p.root)
+    assert cached.base_context["faker"] is p.base_context["faker"]
+    assert isinstance(cached.generate(), dict)
+
+    JSF.from_json(TestData / "custom.json", cache_dir=cache_dir, seed=1)
+    assert len(list(cache_dir.glob("*.pickle"))) == 2
+
+
+def test_from_json_cache_write_failure(TestData, tmp_path, caplog):
+    # A file where the cache directory should be makes every write fail
+    cache_dir = tmp_path / "cache"
+    cache_dir.write_text("")
+    p = JSF.from_json(TestData / "custom.json", cache_dir=cache_dir)
+    assert isinstance(p.generate(), dict)
+    assert "Unable to cache the parsed schema" in caplog.text
+
+
+def test_from_json_cache_key_is_stable(TestData, tmp_path):
+    cache_dir = tmp_path / "cache"
+    for _ in range(2):
+        JSF.from_json(
+            TestData / "custom.json", initial_state={"b": [1], "a": 2}, cache_dir=cache_dir
+        )
+    JSF.from_json(TestData / "custom.json", initial_state={"a": 2, "b": [1]}, cache_dir=cache_dir)
+    assert len(list(cache_dir.glob("*.pickle"))) == 1
+
+    # State that can't be keyed is never served from the cache
+    p = JSF.from_json(TestData / "custom.json", initial_state={"o": object()}, cache_dir=cache_dir)
+    assert isinstance(p.generate(), dict)
+    assert len(list(cache_dir.glob("*.pickle"))) == 1
+
+
+def test_from_json_cache_checks_external_documents(tmp_path):
+    common = tmp_path / "common.json"
+    common.write_text(json.dumps({"definitions": {"Id": {"type": "integer"}}}))
+    schema = tmp_path / "schema.json"
+    schema.write_text(
+        json.dumps({"type": "object", "properties": {"id": {"$ref": f"{common}#/definitions/Id"}}})
+    )
+    cache_dir = tmp_path / "cache"
+
+    assert isinstance(JSF.from_json(schema, cache_dir=cache_dir).root.properties[0], Integer)
+    common.write_text(json.dumps({"definitions": {"Id": {"type": "string"}}}))
+    _load_external.cache_clear()
+    assert isinstance(JSF.from_json(schema, cache_dir=cache_dir).root.properties[0], String)
+
+
+def test_import_is_lazy():
+    code = (
+        "import sys, jsf; jsf.JSF({'type': 'integer'}).generate();"
+        "print(sorted({'faker', 'jsonschema', 'smart_open', 'requests'} & set(sys.modules)))"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    output = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "[]"
+
+
+# A generous ceiling on the time `import jsf` takes, most of which is pydantic
+IMPORT_TIME_BUDGET = 0.5
+
+
+def test_import_time_budget():
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    # The fastest of a few runs, so that a busy machine doesn't fail the test
+    timings = []
+    for _ in range(3):
+        stderr = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import jsf"],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stderr
+        # Each line reads "import time: <self us> | <cumulative us> | <module>"
+        cumulative = [
+            int(line.split("|")[1]) for line in stderr.splitlines() if line.endswith("| jsf")
+        ]
+        timings.append(cumulative[0] / 1e6)
+    assert min(timings) < IMPORT_TIME_BUDGET
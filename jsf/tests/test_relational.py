@@ -0,0 +1,114 @@
+import json
+from random import Random
+
+import pytest  # pants: no-infer-dep
+from jsf.relational import Dataset, KeyIndex
+
+USERS = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "integer", "minimum": 1, "maximum": 1000000},
+        "name": {"type": "string", "$provider": "faker.name"},
+    },
+    "required": ["id", "name"],
+}
+ORDERS = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "string", "format": "uuid"},
+        "user_id": {"type": "integer"},
+    },
+    "required": ["id", "user_id"],
+}
+LINE_ITEMS = {
+    "type": "object",
+    "properties": {
+        "order_id": {"type": "string"},
+        "quantity": {"type": "integer", "minimum": 1, "maximum": 5},
+    },
+    "required": ["order_id", "quantity"],
+}
+RELATIONS = {"orders.user_id": "users.id", "line_items.order_id": "orders.id"}
+
+
+def test_dataset():
+    dataset = Dataset(
+        {"line_items": LINE_ITEMS, "orders": ORDERS, "users": USERS}, RELATIONS, seed=42
+    )
+    assert list(dataset.generators) == ["users", "orders", "line_items"]
+    counts = {"users": 50, "orders": 200, "line_items": 1000}
+    records = dataset.generate(counts)
+    assert {table: len(r) for table, r in records.items()} == counts
+
+    user_ids = [user["id"] for user in records["users"]]
+    order_ids = [order["id"] for order in records["orders"]]
+    assert len(set(user_ids)) == 50 and len(set(order_ids)) == 200
+    assert all(order["user_id"] in set(user_ids) for order in records["orders"])
+    assert all(item["order_id"] in set(order_ids) for item in records["line_items"])
+
+    assert records == dataset.generate(counts)
+
+
+def test_dataset_ref_keys():
+    definitions = {"Id": {"type": "integer", "minimum": 1, "maximum": 1000000}}
+    users = {
+        "type": "object",
+        "definitions": definitions,
+        "properties": {"id": {"$ref": "#/definitions/Id"}},
+        "required": ["id"],
+    }
+    orders = {
+        "type": "object",
+        "$defs": definitions,
+        "properties": {"user_id": {"$ref": "#/$defs/Id"}},
+        "required": ["user_id"],
+    }
+    records = Dataset({"users": users, "orders": orders}, {"orders.user_id": "users.id"}).generate(
+        {"users": 20, "orders": 100}
+    )
+    user_ids = {user["id"] for user in records["users"]}
+    assert len(user_ids) == 20
+    assert all(order["user_id"] in user_ids for order in records["orders"])
+
+    orders["properties"]["user_id"] = {"$ref": "other.json#/definitions/Id"}
+    with pytest.raises(ValueError, match="can't be inlined"):
+        Dataset({"users": users, "orders": orders}, {"orders.user_id": "users.id"})
+
+
+def test_dataset_to_jsonl(tmp_path):
+    dataset = Dataset({"users": USERS, "orders": ORDERS}, {"orders.user_id": "users.id"})
+    dataset.to_jsonl(tmp_path, {"users": 10, "orders": 30})
+    users = [json.loads(line) for line in (tmp_path / "users.jsonl").read_text().splitlines()]
+    orders = [json.loads(line) for line in (tmp_path / "orders.jsonl").read_text().splitlines()]
+    assert len(users) == 10 and len(orders) == 30
+    assert {order["user_id"] for order in orders} <= {user["id"] for user in users}
+
+
+@pytest.mark.parametrize(
+    "relations, match",
+    [
+        ({"orders.user_id": "customers.id"}, "Invalid reference 'customers.id'"),
+        ({"orders.customer_id": "users.id"}, "orders has no property 'customer_id'"),
+        ({"orders.user_id": "users.id", "users.id": "orders.user_id"}, "form a cycle"),
+    ],
+)
+def test_dataset_invalid_relations(relations, match):
+    with pytest.raises(ValueError, match=match):
+        Dataset({"users": USERS, "orders": ORDERS}, relations)
+
+
+def test_key_index():
+    index = KeyIndex("users.id", capacity=100, seed=0)
+    for key in range(10000):
+        index.add(key)
+    assert len(index) == 100 and index.seen == 10000
+    # Later keys are as likely to be held as earlier ones
+    assert 20 < sum(key >= 5000 for key in index.keys) < 80
+    assert index.sample(Random(0)) in set(index.keys)
+
+    index.add("not-an-integer")
+    assert isinstance(index.keys, list) and len(index) == 100
+
+    index.clear()
+    with pytest.raises(ValueError, match="no keys of users.id"):
+        index.sample(Random(0))
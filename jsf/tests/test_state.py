@@ -0,0 +1,48 @@
+from jsf.parser import JSF
+from jsf.state import State
+
+
+def test_state_reads_through_to_base():
+    base = {"counter": 1, "items": [1, 2], "paths": ("#", "#/a")}
+    state = State(base)
+
+    assert state["counter"] == 1
+    assert state["paths"] is base["paths"]
+    assert "items" in state and "missing" not in state
+    assert state.get("missing", 3) == 3
+    assert dict(state) == base
+    assert len(state) == 3
+
+
+def test_state_copies_on_write():
+    base = {"items": [1, 2], "counter": 1}
+    state = State(base)
+
+    state["items"].append(3)
+    state["counter"] += 1
+    state["new"] = True
+    del state["counter"]
+
+    assert state == {"items": [1, 2, 3], "new": True}
+    assert base == {"items": [1, 2], "counter": 1}
+    assert State(base)["items"] == [1, 2]
+
+
+def test_state_is_isolated_between_generations():
+    schema = {
+        "type": "object",
+        "properties": {
+            "seen": {
+                "type": "integer",
+                "$provider": "lambda: state['seen'].append(1) or len(state['seen'])",
+            },
+            "id": {"type": "integer", "$provider": "lambda: next(state['__counter__'])"},
+        },
+        "required": ["seen", "id"],
+    }
+    p = JSF(schema, initial_state={"seen": []})
+
+    assert p.generate() == {"seen": 1, "id": 1}
+    assert p.generate() == {"seen": 1, "id": 1}
+    assert p.generate(3) == [{"seen": i, "id": i} for i in range(1, 4)]
+    assert p.base_state["seen"] == []
@@ -1,12 +1,167 @@
+import base64
+import binascii
+import gzip
+import io
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from random import Random
+
 import pytest  # pants: no-infer-dep
 from jsf.schema_types.string import random_fixed_length_sentence
+from jsf.schema_types.string_utils.content_encoding import ContentEncoding, encode
+from jsf.schema_types.string_utils.content_type.application__gzip import render_gzip
+from jsf.schema_types.string_utils.content_type.application__zip import render_zip
+from jsf.schema_types.string_utils.content_type.dimensions import DEFAULT_DIMENSION
+from jsf.schema_types.string_utils.content_type.image__jpeg import pool as jpeg_pool
+from jsf.schema_types.string_utils.content_type.image__jpeg import render_jpeg
+from jsf.schema_types.string_utils.content_type.image__webp import pool as webp_pool
+from jsf.schema_types.string_utils.content_type.image__webp import render_webp
+from jsf.schema_types.string_utils.content_type.pool import BlobPool
+from jsf.schema_types.string_utils.regex import compile_regex
 
 
 @pytest.mark.parametrize(
     "_min, _max",
-    [(0, 1), (0, 0), (0, 10), (10, 20), (10, 2000)],
+    [(0, 1), (0, 0), (0, 10), (10, 20), (10, 2000), (1_000_000, 2_000_000)],
 )
 def test_random_fixed_length_sentence(_min, _max):
     gen = random_fixed_length_sentence(_min, _max)
     assert len(gen) <= _max
     assert len(gen) >= _min
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        r"^[A-Z]{3}-\d{4}$",
+        r"(foo|bar)+baz?",
+        r"[^a-z\s]{2,5}",
+        r"\w+@\w+\.(com|org)",
+        r"(?P<word>[a-z]{2})-(?P=word)",
+        r"(?=ab)ab(?<=b)(?!\d)\W",
+        r"[\d\-_]*x?",
+        r"",
+    ],
+)
+def test_compile_regex(pattern):
+    generate = compile_regex(pattern)
+    rng = Random(0)
+    for _ in range(50):
+        assert re.fullmatch(pattern, generate(rng))
+    assert compile_regex(pattern) is generate
+    assert generate(Random(1)) == generate(Random(1))
+
+
+@pytest.mark.parametrize("render, image_format", [(render_jpeg, "JPEG"), (render_webp, "WEBP")])
+@pytest.mark.parametrize(
+    "_min, _max", [(None, None), (None, 1000), (5000, None), (300, 400), (70_000, 70_010)]
+)
+def test_render_image(render, image_format, _min, _max):
+    for seed in range(5):
+        image = render(_min, _max, Random(seed))
+        assert _min is None or len(image) >= _min
+        assert _max is None or len(image) <= _max
+        assert image == render(_min, _max, Random(seed))
+
+        Image = pytest.importorskip("PIL.Image")
+        decoded = Image.open(io.BytesIO(image))
+        decoded.load()
+        assert decoded.format == image_format
+
+
+@pytest.mark.parametrize("render, pool", [(render_jpeg, jpeg_pool), (render_webp, webp_pool)])
+def test_image_dimensions(render, pool):
+    Image = pytest.importorskip("PIL.Image")
+    image = render(None, None, Random(0), width=(640, 640), height=(1, 480))
+    width, height = Image.open(io.BytesIO(image)).size
+    assert width == 640 and 1 <= height <= 480
+
+    pool.configure(width=(32, 32), height=(16, 16))
+    try:
+        assert Image.open(io.BytesIO(pool.draw(None, None, Random(0)))).size == (32, 16)
+    finally:
+        pool.configure(width=DEFAULT_DIMENSION, height=DEFAULT_DIMENSION)
+
+    with pytest.raises(ValueError, match="Invalid image width range 0-10"):
+        render(None, None, Random(0), width=(0, 10))
+
+
+@pytest.mark.parametrize(
+    "render, decompress",
+    [
+        (render_zip, lambda b: zipfile.ZipFile(io.BytesIO(b)).testzip()),
+        (render_gzip, gzip.decompress),
+    ],
+)
+@pytest.mark.parametrize(
+    "_min, _max", [(None, None), (None, 60), (100, None), (300, 400), (1_000_000, 1_000_000)]
+)
+def test_render_archive(render, decompress, _min, _max):
+    for seed in range(5):
+        archive = render(_min, _max, Random(seed))
+        assert _min is None or len(archive) >= _min
+        assert _max is None or len(archive) <= _max
+        assert archive == render(_min, _max, Random(seed))
+        decompress(archive)
+
+
+def test_blob_pool():
+    rendered = []
+
+    def render(_min, _max, rng):
+        rendered.append((_min, _max))
+        return bytes(_min or 1)
+
+    pool = BlobPool(render, size=1, fresh_every=None, max_bounds=2)
+    rng = Random(0)
+    assert {pool.draw(5, 10, rng) for _ in range(20)} == {bytes(5)}
+    assert len(rendered) == 1
+
+    # About one draw in fresh_every renders a fresh payload
+    pool.configure(size=1, fresh_every=4)
+    rendered.clear()
+    for _ in range(400):
+        pool.draw(5, 10, rng)
+    assert 1 + 50 < len(rendered) < 1 + 150
+
+    pool.draw(None, None, rng)
+    pool.draw(5, 10, rng)
+    pool.draw(1, None, rng)
+    assert list(pool._pools) == [(5, 10), (1, None)]
+
+    pool.configure(size=0)
+    rendered.clear()
+    pool.draw(None, None, rng)
+    assert rendered == [(None, None)]
+    with pytest.raises(ValueError):
+        pool.configure(lifetime=3)
+
+
+def test_blob_pool_threads():
+    pool = BlobPool(lambda _min, _max, rng: bytes(_max), size=4, max_bounds=8)
+    with ThreadPoolExecutor(8) as executor:
+        blobs = list(executor.map(lambda n: pool.draw(n % 16, n % 16 + 1, Random(n)), range(2000)))
+    assert all(len(blob) == n % 16 + 1 for n, blob in enumerate(blobs))
+    assert len(pool._pools) == 8
+
+
+@pytest.mark.parametrize(
+    "encoding, decode",
+    [
+        (ContentEncoding.BASE16, base64.b16decode),
+        (ContentEncoding.BASE32, base64.b32decode),
+        (ContentEncoding.BASE64, base64.b64decode),
+        (ContentEncoding.QUOTED_PRINTABLE, binascii.a2b_qp),
+    ],
+)
+@pytest.mark.parametrize("content", ["Lorem ipsum dolor sit amet " * 10, bytes(range(256)) * 4])
+def test_encode(encoding, decode, content):
+    expected = content.encode("utf-8") if isinstance(content, str) else content
+    assert decode(encode(content, encoding)) == expected
+
+
+def test_encode_binary():
+    assert encode(b"\x00\x05\xff", ContentEncoding.BINARY) == "010111111111"
+    assert encode("A", ContentEncoding.BINARY) == "1000001"
+    assert encode(b"\x00'\xff", None) == "\\x00'\\xff"
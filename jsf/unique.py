@@ -0,0 +1,101 @@
+import hashlib
+import json
+import math
+from typing import Any, Dict, List, Set
+
+# Approximate memory taken by each key of the exact index, a 64 bit integer in a set
+EXACT_KEY_BYTES = 70
+# False positive rate of the first Bloom filter, each further filter halves it
+BLOOM_ERROR_RATE = 1e-4
+DEFAULT_MAX_MEMORY = 256 * 2**20
+
+
+def _digest(value: Any) -> int:
+    canonical = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return int.from_bytes(hashlib.blake2b(canonical.encode(), digest_size=8).digest(), "big")
+
+
+class _BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(round(self.size / capacity * math.log(2)), 1)
+        self.bits = bytearray(-(-self.size // 8))
+        self.count = 0
+
+    def _positions(self, key: int) -> List[int]:
+        # Double hashing, the second hash being the key remixed by a multiplicative hash
+        step = ((key * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) | 1
+        return [(key + i * step) % self.size for i in range(self.hashes)]
+
+    def __contains__(self, key: int) -> bool:
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def add(self, key: int) -> None:
+        bits = self.bits
+        for p in self._positions(key):
+            bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+
+class UniqueIndex:
+    """The values a `$unique` field has taken so far.
+
+    Values are keyed by a 64 bit digest of their canonical JSON. Keys are
+    first held exactly, in a set. Past max_memory bytes they move to a
+    scalable Bloom filter, a chain of filters each twice as large and with
+    half the false positive rate of the one before, which takes a few bytes
+    per key. A false positive only costs a retry, so values are never
+    repeated either way.
+    """
+
+    def __init__(self, max_memory: int = DEFAULT_MAX_MEMORY):
+        self.max_memory = max_memory
+        self._keys: Set[int] = set()
+        self._filters: List[_BloomFilter] = []
+        self.count = 0
+
+    def add(self, value: Any) -> bool:
+        """Adds the value to the index, returning False if it was already
+        there."""
+        key = _digest(value)
+        if not self._filters:
+            if key in self._keys:
+                return False
+            self._keys.add(key)
+            self.count += 1
+            if len(self._keys) * EXACT_KEY_BYTES > self.max_memory:
+                self._spill()
+            return True
+
+        if any(key in f for f in self._filters):
+            return False
+        current = self._filters[-1]
+        if current.count >= current.capacity:
+            current = _BloomFilter(2 * current.capacity, current.error_rate / 2)
+            self._filters.append(current)
+        current.add(key)
+        self.count += 1
+        return True
+
+    def _spill(self) -> None:
+        bloom = _BloomFilter(2 * len(self._keys), BLOOM_ERROR_RATE)
+        for key in self._keys:
+            bloom.add(key)
+        self._filters.append(bloom)
+        self._keys = set()
+
+
+class UniqueIndexes(Dict[str, UniqueIndex]):
+    """The indexes of the `$unique` fields of one generation, keyed by JSON
+    path and created on first use."""
+
+    def __init__(self, max_memory: int = DEFAULT_MAX_MEMORY):
+        super().__init__()
+        self.max_memory = max_memory
+
+    def __missing__(self, path: str) -> UniqueIndex:
+        index = self[path] = UniqueIndex(self.max_memory)
+        return index